@@ -0,0 +1,36 @@
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Optional, Set
+
+from config import config as conf
+from ..cache import TTLCache
+
+
+class TokenCache(TTLCache):
+    """Bearer token -> resolved user, indexed by user id for invalidation."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize, ttl)
+        self._tokens_by_user: Dict[int, Set[str]] = defaultdict(set)
+
+    def set(self, token: str, user: Any, ttl: Optional[float] = None) -> None:
+        super().set(token, user, ttl)
+        if token in self._data:
+            self._tokens_by_user[user.id].add(token)
+
+    def invalidate_token(self, token: str) -> None:
+        self.pop(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self.pop(token)
+
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        tokens = self._tokens_by_user.get(value.id)
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._tokens_by_user[value.id]
+
+
+token_cache = TokenCache(conf.token_cache_size, conf.token_cache_ttl)
+epoch_cache = TTLCache(conf.token_cache_size, conf.token_epoch_cache_ttl)
@@ -1,29 +1,94 @@
-from fastapi import Depends, HTTPException, status
+import time
+
+import jwt
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
-from ..user.models import User
-from ..user.queries import get_user_by_id
-from .queries import get_token
+from config import config as conf
+from ..database import get_session, pin_reads_to_primary
+from ..user.models import User, Role
+from .cache import token_cache
+from .queries import get_token_with_user, get_user_token_epoch
 
 
 async def verify_token_and_get_user(session: AsyncSession, token: str) -> User:
-    token = await get_token(session, token)
+    row = await get_token_with_user(session, token)
 
-    if token is None:
+    if row is None:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "token not found")
 
-    await token.verify_token(session, None)
-    user = await get_user_by_id(session, token.user_id)
+    decode_token(row.token)
 
-    return user
+    return User(
+        id=row.id,
+        username=row.username,
+        full_name=row.full_name,
+        role=row.role,
+    )
+
+
+async def verify_claims_and_get_user(session: AsyncSession, payload: dict) -> User:
+    epoch = await get_user_token_epoch(session, payload["identity"])
+
+    if epoch is None or epoch != payload.get("epoch"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return User(
+        id=payload["identity"],
+        username=payload["username"],
+        role=Role(payload["role"]),
+    )
+
+
+def decode_token(token: str) -> dict:
+    try:
+        return jwt.decode(token, conf.secret_key, algorithms=["HS256"])
+
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    except jwt.InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="token is invalid",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def token_ttl(token: str) -> float:
+    payload = jwt.decode(token, options={"verify_signature": False})
+    return payload["exp"] - time.time()
 
 
 async def get_current_user(
+    request: Request,
     session: AsyncSession = Depends(get_session),
     token: str = Depends(OAuth2PasswordBearer(tokenUrl="/auth/login")),
 ) -> User:
-    print(token)
-    user = await verify_token_and_get_user(session, token)
+    user = None
+
+    if conf.auth_stateless:
+        payload = decode_token(token)
+        if "role" in payload:
+            user = await verify_claims_and_get_user(session, payload)
+
+    if user is None:
+        user = token_cache.get(token)
+
+    if user is None:
+        user = await verify_token_and_get_user(session, token)
+        token_cache.set(token, user, token_ttl(token))
+
+    if request.method not in ("GET", "HEAD"):
+        pin_reads_to_primary(user.id)
+
     return user
@@ -1,12 +1,25 @@
-from typing import Tuple
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update, delete, and_, case, literal_column, true, Row
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config import config as conf
+
 from ..user.queries import get_user_by_username
+from ..user.hashing import hash_passwords
 from ..user.models import User, Token
-from ..user.schemes import UserCreate, BaseUser
+from ..user.schemes import (
+    UserCreate,
+    BaseUser,
+    UserImportRow,
+    UserImportResult,
+    UserImportResponse,
+)
+from .cache import token_cache, epoch_cache
+from .validator import BulkRegistrationValidator
 
 
 async def registration_user(session: AsyncSession, user_create: UserCreate) -> BaseUser:
@@ -25,10 +38,88 @@ async def registration_user(session: AsyncSession, user_create: UserCreate) -> B
     )
 
 
-async def get_user_token(session: AsyncSession, user_id: int):
-    result = await session.execute(select(Token).where(Token.user_id == user_id))
+async def insert_users(
+    session: AsyncSession, rows: List[UserImportRow]
+) -> Dict[str, BaseUser]:
+    hashed_passwords = await hash_passwords([row.password for row in rows])
+
+    result = await session.execute(
+        insert(User)
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User.id, User.username, User.full_name, User.role),
+        [
+            {
+                "username": row.username,
+                "full_name": row.full_name,
+                "role": row.role,
+                "hashed_password": hashed_password,
+            }
+            for row, hashed_password in zip(rows, hashed_passwords)
+        ],
+    )
+    users = {
+        user.username: BaseUser(
+            id=user.id,
+            username=user.username,
+            role=user.role.value,
+            full_name=user.full_name,
+        )
+        for user in result.all()
+    }
+    await session.commit()
 
-    return result.scalar_one_or_none()
+    return users
+
+
+async def bulk_registration(
+    session: AsyncSession, rows: List[dict]
+) -> UserImportResponse:
+    validator = BulkRegistrationValidator(rows, session)
+    valid_rows, errors = await validator.validate()
+
+    users = {}
+    if valid_rows:
+        users = await insert_users(session, list(valid_rows.values()))
+
+    results = []
+    for index, raw_row in enumerate(rows):
+        if index in errors:
+            results.append(
+                UserImportResult(
+                    row=index + 1,
+                    username=(
+                        raw_row.get("username") if isinstance(raw_row, dict) else None
+                    ),
+                    status_code=errors[index].status_code,
+                    detail=errors[index].detail,
+                )
+            )
+            continue
+
+        username = valid_rows[index].username
+        user = users.get(username)
+        results.append(
+            UserImportResult(
+                row=index + 1,
+                username=username,
+                status_code=(
+                    status.HTTP_201_CREATED if user else status.HTTP_409_CONFLICT
+                ),
+                detail=(
+                    "user registered"
+                    if user
+                    else "A user with this username already exists"
+                ),
+                user=user,
+            )
+        )
+
+    return UserImportResponse(
+        message="users imported",
+        created=len(users),
+        failed=len(rows) - len(users),
+        results=results,
+    )
 
 
 async def login(
@@ -47,24 +138,79 @@ async def login(
             status.HTTP_401_UNAUTHORIZED, detail="password is incorrect"
         )
 
-    token = await get_user_token(session, user.id)
+    return await issue_token(session, user)
 
-    if token is None:
-        token = await user.generate_token()
-        token = Token(user_id=user.id, token=token)
-        status_code = status.HTTP_201_CREATED
-        msg = "token created"
 
-        session.add(token)
-        await session.commit()
+async def issue_token(session: AsyncSession, user: User) -> Tuple[int, str, str]:
+    now = datetime.now()
+    expires_at = now + timedelta(seconds=conf.token_lifetime)
+    epoch = user.token_epoch if conf.auth_stateless else None
+    new_token = await user.generate_token()
+
+    keep_current = and_(
+        Token.expires_at > now,
+        Token.epoch == epoch if conf.auth_stateless else true(),
+    )
+
+    statement = insert(Token).values(
+        user_id=user.id, token=new_token, expires_at=expires_at, epoch=epoch
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[Token.user_id],
+        set_={
+            "token": case((keep_current, Token.token), else_=statement.excluded.token),
+            "expires_at": case(
+                (keep_current, Token.expires_at), else_=statement.excluded.expires_at
+            ),
+            "epoch": case((keep_current, Token.epoch), else_=statement.excluded.epoch),
+        },
+    ).returning(Token.token, literal_column("xmax = 0").label("created"))
+
+    result = await session.execute(statement)
+    token, created = result.one()
+    await session.commit()
+
+    if created:
+        return status.HTTP_201_CREATED, "token created", token
 
-    else:
-        status_code, msg, token = await token.verify_token(session, user)
+    if token == new_token:
+        token_cache.invalidate_user(user.id)
+        return status.HTTP_200_OK, "token updated", token
 
-    return status_code, msg, token.token
+    return status.HTTP_200_OK, "token verification", token
 
 
-async def get_token(session: AsyncSession, token: str) -> Token:
-    result = await session.execute(select(Token).where(Token.token == token))
+async def get_token_with_user(session: AsyncSession, token: str) -> Optional[Row]:
+    result = await session.execute(
+        select(Token.token, User.id, User.username, User.full_name, User.role)
+        .join(User, User.id == Token.user_id)
+        .where(Token.token == token)
+    )
+
+    return result.one_or_none()
+
+
+async def get_user_token_epoch(session: AsyncSession, user_id: int) -> Optional[int]:
+    epoch = epoch_cache.get(user_id)
+
+    if epoch is None:
+        result = await session.execute(
+            select(User.token_epoch).where(User.id == user_id)
+        )
+        epoch = result.scalar_one_or_none()
+
+        if epoch is not None:
+            epoch_cache.set(user_id, epoch)
+
+    return epoch
+
+
+async def revoke_user_tokens(session: AsyncSession, user_id: int) -> None:
+    await session.execute(
+        update(User).where(User.id == user_id).values(token_epoch=User.token_epoch + 1)
+    )
+    await session.execute(delete(Token).where(Token.user_id == user_id))
+    await session.commit()
 
-    return result.scalar_one_or_none()
+    token_cache.invalidate_user(user_id)
+    epoch_cache.pop(user_id)
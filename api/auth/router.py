@@ -1,12 +1,15 @@
-from fastapi import Depends, APIRouter, status
+from fastapi import Depends, APIRouter, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..user.schemes import UserCreate, UserResponse
+from ..user.schemes import UserCreate, UserResponse, UserImportResponse
+from ..user.middleware import role_checker
+from ..user.models import User, Role
 from ..database import get_session
 
-from .schemes import LoginForm, TokenResponse
+from .schemes import LoginForm, TokenResponse, read_import_rows
 from . import queries as qr
+from .middleware import get_current_user
 from .validator import RegistrationValidator
 
 router = APIRouter(prefix="/auth")
@@ -32,6 +35,18 @@ async def create_user(
     )
 
 
+@router.post("/registration/bulk", response_model=UserImportResponse)
+async def create_users(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    await role_checker(current_user, [Role.ADMIN], "only admin can import users")
+
+    rows = await read_import_rows(request)
+    return await qr.bulk_registration(session, rows)
+
+
 @router.post("/login", response_class=JSONResponse)
 async def get_token(
     login_form: LoginForm = Depends(LoginForm.as_form),
@@ -44,3 +59,14 @@ async def get_token(
         content=TokenResponse(message=message, access_token=token).dict(),
         status_code=code,
     )
+
+
+@router.post("/revoke/{user_id}")
+async def revoke_tokens(
+    user_id: int,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    await role_checker(current_user, [Role.ADMIN], "only admin can revoke tokens")
+    await qr.revoke_user_tokens(session, user_id)
+    return {"detail": "tokens revoked"}
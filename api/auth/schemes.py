@@ -1,5 +1,8 @@
-from fastapi import Form
-from typing import Optional
+import csv
+import io
+import json
+from fastapi import Form, HTTPException, Request, status
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -28,3 +31,46 @@ class LoginForm(BaseModel):
 class TokenResponse(BaseModel):
     message: str
     access_token: str
+
+
+async def read_import_rows(request: Request) -> List[dict]:
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        file = form.get("file")
+        if file is None or isinstance(file, str):
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_ENTITY, "CSV file is required"
+            )
+        return read_csv_rows(await file.read())
+
+    if content_type.startswith("text/csv"):
+        return read_csv_rows(await request.body())
+
+    try:
+        rows = await request.json()
+    except json.JSONDecodeError:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_ENTITY, "Invalid JSON")
+
+    if not isinstance(rows, list):
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, "Expected a list of users"
+        )
+
+    return rows
+
+
+def read_csv_rows(raw: bytes) -> List[dict]:
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, "CSV must be UTF-8 encoded"
+        )
+
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {key: value for key, value in row.items() if key and value not in (None, "")}
+        for row in reader
+    ]
@@ -1,9 +1,14 @@
 import re
+from typing import Dict, List, Tuple
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 from sqlalchemy.sql import select, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..user.models import User
+from ..user.schemes import UserImportRow
+
+MAX_IMPORT_ROWS = 1000
 
 
 class ValidateError(Exception):
@@ -33,25 +38,31 @@ class RegistrationValidator:
 
     async def validate(self):
         try:
-            await self.validate_username()
-            await self.validate_password()
-            await self.validate_full_name()
+            await self.validate_username_unique()
+            await self.validate_fields()
 
         except ValidateError as e:
             raise HTTPException(status_code=e.status_code, detail=e.detail)
 
+    async def validate_fields(self):
+        await self.validate_username()
+        await self.validate_password()
+        await self.validate_full_name()
+
     async def user_exists_by_username(self) -> bool:
         result = await self.session.execute(
             select(exists().where(User.username == self.username))
         )
         return result.scalar()
 
-    async def validate_username(self):
+    async def validate_username_unique(self):
         user_exists = await self.user_exists_by_username()
         if user_exists:
             raise ValidateError(
                 "A user with this username already exists", status.HTTP_409_CONFLICT
             )
+
+    async def validate_username(self):
         if not self.username or self.username == "":
             raise ValidateError(
                 "Username cannot be empty", status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -124,3 +135,87 @@ class RegistrationValidator:
                 "The full name must consist of three words written in Russian letters only",
                 status.HTTP_422_UNPROCESSABLE_ENTITY,
             )
+
+
+class BulkRegistrationValidator:
+    def __init__(self, rows: List[dict], session: AsyncSession) -> None:
+        self.rows = rows
+        self.session = session
+
+    async def validate(
+        self,
+    ) -> Tuple[Dict[int, UserImportRow], Dict[int, ValidateError]]:
+        if not self.rows:
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_ENTITY, "Import contains no rows"
+            )
+        if len(self.rows) > MAX_IMPORT_ROWS:
+            raise HTTPException(
+                status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                f"Import must not exceed {MAX_IMPORT_ROWS} rows",
+            )
+
+        valid_rows: Dict[int, UserImportRow] = {}
+        errors: Dict[int, ValidateError] = {}
+        usernames = set()
+
+        for index, raw_row in enumerate(self.rows):
+            try:
+                row = await self.validate_row(raw_row)
+                if row.username in usernames:
+                    raise ValidateError(
+                        "Username is repeated in the import", status.HTTP_409_CONFLICT
+                    )
+                usernames.add(row.username)
+                valid_rows[index] = row
+
+            except ValidateError as e:
+                errors[index] = e
+
+        existing = await self.existing_usernames(usernames)
+        for index, row in list(valid_rows.items()):
+            if row.username in existing:
+                errors[index] = ValidateError(
+                    "A user with this username already exists", status.HTTP_409_CONFLICT
+                )
+                del valid_rows[index]
+
+        return valid_rows, errors
+
+    async def validate_row(self, raw_row: dict) -> UserImportRow:
+        if not isinstance(raw_row, dict):
+            raise ValidateError(
+                "Row must be an object", status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+
+        try:
+            row = UserImportRow(**raw_row)
+        except ValidationError as e:
+            fields = ", ".join(str(error["loc"][0]) for error in e.errors())
+            raise ValidateError(
+                f"Invalid or missing fields: {fields}",
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        if row.confirm_password is None:
+            row.confirm_password = row.password
+
+        validator = RegistrationValidator(
+            row.username,
+            row.password,
+            row.confirm_password,
+            row.full_name,
+            self.session,
+        )
+        await validator.validate_fields()
+
+        return row
+
+    async def existing_usernames(self, usernames: set) -> set:
+        if not usernames:
+            return set()
+
+        result = await self.session.execute(
+            select(User.username).where(User.username.in_(usernames))
+        )
+        return set(result.scalars().all())
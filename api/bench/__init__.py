@@ -0,0 +1,19 @@
+"""Benchmarks, one module per scenario.
+
+Usage: python -m api.bench.<module> --help
+"""
+
+import statistics
+from typing import List
+
+
+def latency_summary(samples: List[float]) -> str:
+    """p50/p95/p99/max of samples given in seconds, printed in milliseconds."""
+    if len(samples) < 2:
+        return f"n={len(samples)}"
+
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return (
+        f"n={len(samples)} p50={cuts[49] * 1000:.1f}ms p95={cuts[94] * 1000:.1f}ms "
+        f"p99={cuts[98] * 1000:.1f}ms max={max(samples) * 1000:.1f}ms"
+    )
@@ -0,0 +1,155 @@
+"""/auth/login latency while /news_list is under concurrent read load.
+
+Usage: python -m api.bench.login [--executor inline|thread|process]
+           [--readers N] [--logins N] [--login-clients N]
+
+Starts the API with uvicorn on a free local port, keeps --readers clients
+requesting /news_list in a loop, logs a throwaway user in --logins times
+and prints latency percentiles for both. --executor inline runs bcrypt on
+the event loop, which is how it worked before the hashing pool.
+"""
+
+import argparse
+import asyncio
+import socket
+import time
+import uuid
+from typing import List
+
+import aiohttp
+import bcrypt
+import uvicorn
+from sqlalchemy import delete
+
+from config import config as conf
+from ..database import async_session
+from ..news.models import News  # noqa: F401  (registers the User.news mapper)
+from ..user import models as user_models
+from ..user.hashing import hash_password
+from ..user.models import Token, User
+from . import latency_summary
+
+PASSWORD = "Bench-passw0rd"
+
+
+async def check_password_inline(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def create_user() -> User:
+    user = User(
+        username=f"bench_{uuid.uuid4().hex[:12]}",
+        full_name="Бенчмарков Бенчмарк Бенчмаркович",
+        hashed_password=await hash_password(PASSWORD),
+    )
+    async with async_session() as session:
+        session.add(user)
+        await session.commit()
+    return user
+
+
+async def drop_user(user: User) -> None:
+    async with async_session() as session:
+        await session.execute(delete(Token).where(Token.user_id == user.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+async def read_loop(
+    client: aiohttp.ClientSession, samples: List[float], stop: asyncio.Event
+) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        async with client.get("/news_list") as response:
+            await response.read()
+        samples.append(time.perf_counter() - start)
+
+
+async def login_loop(
+    client: aiohttp.ClientSession, username: str, count: int, samples: List[float]
+) -> None:
+    for _ in range(count):
+        start = time.perf_counter()
+        async with client.post(
+            "/auth/login", data={"username": username, "password": PASSWORD}
+        ) as response:
+            await response.read()
+            response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+
+
+async def bench(executor: str, readers: int, logins: int, login_clients: int) -> None:
+    from ..main import app
+
+    if executor == "inline":
+        user_models.check_password = check_password_inline
+    else:
+        conf.password_hasher_executor = executor
+
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    user = await create_user()
+    stop = asyncio.Event()
+    read_samples: List[float] = []
+    login_samples: List[float] = []
+    try:
+        async with aiohttp.ClientSession(f"http://127.0.0.1:{port}") as client:
+            reading = [
+                asyncio.create_task(read_loop(client, read_samples, stop))
+                for _ in range(readers)
+            ]
+            await asyncio.sleep(1)
+            read_samples.clear()
+
+            started = time.perf_counter()
+            per_client = max(logins // login_clients, 1)
+            await asyncio.gather(
+                *(
+                    login_loop(client, user.username, per_client, login_samples)
+                    for _ in range(login_clients)
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+            stop.set()
+            await asyncio.gather(*reading)
+    finally:
+        await drop_user(user)
+        server.should_exit = True
+        await serving
+
+    print(f"executor={executor} readers={readers} login_clients={login_clients}")
+    print(f"/auth/login  {latency_summary(login_samples)}")
+    print(
+        f"/news_list   {latency_summary(read_samples)} "
+        f"({len(read_samples) / elapsed:.0f} req/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--executor",
+        choices=["inline", "thread", "process"],
+        default=conf.password_hasher_executor,
+        help="where bcrypt runs; inline blocks the event loop",
+    )
+    parser.add_argument("--readers", type=int, default=20, help="/news_list clients")
+    parser.add_argument("--logins", type=int, default=100, help="total logins")
+    parser.add_argument(
+        "--login-clients", type=int, default=4, help="concurrent login clients"
+    )
+    args = parser.parse_args()
+    asyncio.run(bench(args.executor, args.readers, args.logins, args.login_clients))
@@ -0,0 +1,149 @@
+"""/news/search latency over a generated news table, with a plan check.
+
+Usage: python -m api.bench.news_search [--rows N] [--repeat N]
+
+Generates --rows news (1M by default) with generate_series inside a
+transaction that is rolled back at the end, so the table is left as it
+was. Each search is timed --repeat times through search_news, then its
+plan is checked for the tsvector and pg_trgm GIN indexes; a missing
+index use or an empty fuzzy match exits with a non-zero status.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import engine
+from ..news import queries as news_qr
+from ..user.models import User
+from . import latency_summary
+
+SEARCH_VECTOR_INDEX = "ix_news_search_vector"
+TRIGRAM_INDEX = "ix_news_title_trgm"
+
+TOPICS = ["Training", "Camp", "Briefing", "Registration", "Medical", "Reserve"]
+SUBJECTS = ["schedule", "update", "results", "notice", "changes", "deadline"]
+
+GENERATE_NEWS = text("""
+    INSERT INTO news (title, content, creator_id, created_at, sort_at)
+    SELECT
+        topics[1 + i % 6] || ' ' || subjects[1 + (i / 6) % 6] || ' ' || i,
+        'Announcement ' || i || ' for the ' || lower(topics[1 + (i / 36) % 6])
+            || ' group: please check the ' || subjects[1 + (i / 216) % 6]
+            || ' before day ' || (i % 365),
+        :creator_id,
+        now() - i * interval '1 minute',
+        now() - i * interval '1 minute'
+    FROM generate_series(1, :rows) AS i,
+        (SELECT CAST(:topics AS text[]) AS topics,
+                CAST(:subjects AS text[]) AS subjects) AS words
+    """)
+
+# (query, what it exercises, index its plan must use)
+SEARCHES = [
+    ("medical deadline", "full-text, common words", SEARCH_VECTOR_INDEX),
+    ("briefing results 4242", "title words plus an id", SEARCH_VECTOR_INDEX),
+    ("Registraton schedle", "misspelled title, trigram only", TRIGRAM_INDEX),
+    ("quartermaster", "no match", SEARCH_VECTOR_INDEX),
+]
+
+
+async def generate(session: AsyncSession, rows: int) -> None:
+    creator = User(
+        username=f"bench_{uuid.uuid4().hex[:12]}",
+        full_name="Бенчмарков Бенчмарк Бенчмаркович",
+        hashed_password="-",
+    )
+    session.add(creator)
+    await session.flush()
+
+    start = time.perf_counter()
+    await session.execute(
+        GENERATE_NEWS,
+        {
+            "creator_id": creator.id,
+            "rows": rows,
+            "topics": TOPICS,
+            "subjects": SUBJECTS,
+        },
+    )
+    await session.execute(text("ANALYZE news"))
+    print(f"generated {rows} news in {time.perf_counter() - start:.1f}s")
+
+
+async def plan_of(session: AsyncSession, q: str) -> List[str]:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await news_qr.search_news(session, q, 0, 10)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    connection = await session.connection()
+    statement, parameters = captured[0]
+    result = await connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+    return [line for (line,) in result]
+
+
+async def bench(rows: int, repeat: int) -> None:
+    failures = []
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        try:
+            result = await session.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+            version = result.scalar()
+            if version is None:
+                raise SystemExit("pg_trgm is not installed; run alembic upgrade head")
+            print(f"pg_trgm {version}")
+
+            await generate(session, rows)
+
+            for q, description, index in SEARCHES:
+                samples = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    news_list, total = await news_qr.search_news(session, q, 0, 10)
+                    samples.append(time.perf_counter() - start)
+
+                plan = await plan_of(session, q)
+                uses_index = any(index in line for line in plan)
+                print(f"=== {q!r} ({description})")
+                print(f"hits={total} top={[news['title'] for news in news_list[:3]]}")
+                print(latency_summary(samples))
+                print(f"plan uses {index}: {'yes' if uses_index else 'NO'}")
+                print()
+
+                if not uses_index:
+                    failures.append(f"{q!r}: plan does not use {index}")
+                    print("\n".join(plan), end="\n\n")
+                if index == TRIGRAM_INDEX and not total:
+                    failures.append(f"{q!r}: no fuzzy title matches")
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+    await engine.dispose()
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="news to generate")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per search")
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.repeat))
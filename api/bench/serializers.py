@@ -0,0 +1,120 @@
+"""Microbenchmark of the list serializers against per-row to_pydantic.
+
+Usage: python -m api.bench.serializers [--rows N] [--creators N] [--repeat N]
+
+Builds --rows transient News and Content objects shared between
+--creators users, no database needed, and times producing the JSON body:
+the old path awaits to_pydantic row by row and validates the result
+against the response_model, the new one is a single serialize_* pass.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List
+
+from pydantic import TypeAdapter
+
+from ..content.models import Content, ContentCategory
+from ..content.schemes import ContentResponse
+from ..content.serializers import serialize_contents
+from ..news.models import News
+from ..news.schemes import NewsResponse
+from ..news.serializers import serialize_news_list
+from ..user.models import Role, User
+
+NEWS_ADAPTER = TypeAdapter(List[NewsResponse])
+CONTENTS_ADAPTER = TypeAdapter(List[ContentResponse])
+
+
+def build_rows(rows: int, creators: int):
+    users = [
+        User(
+            id=index,
+            username=f"user{index}",
+            full_name="Иванов Иван Иванович",
+            role=Role.USER,
+        )
+        for index in range(1, creators + 1)
+    ]
+    categories = list(ContentCategory)
+    now = datetime.now()
+
+    news_list = [
+        News(
+            id=index,
+            title=f"News title {index}",
+            content="News content " * 20,
+            creator=users[index % creators],
+            created_at=now - timedelta(minutes=index),
+            last_updated_at=now if index % 3 == 0 else None,
+        )
+        for index in range(rows)
+    ]
+    contents = [
+        Content(
+            id=index,
+            filename=f"Document {index}",
+            path=f"media/documents/user/Document {index}.docx",
+            extension=".docx",
+            sha256=f"{index:064x}",
+            category=categories[index % len(categories)],
+            creator=users[index % creators],
+            is_archived=False,
+            created_at=now - timedelta(minutes=index),
+            last_updated_at=None,
+        )
+        for index in range(rows)
+    ]
+    return news_list, contents
+
+
+def render(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+async def per_row(rows, adapter: TypeAdapter) -> bytes:
+    validated = adapter.validate_python([await row.to_pydantic() for row in rows])
+    return render(adapter.dump_python(validated, mode="json"))
+
+
+async def timed(run: Callable[[], Awaitable[bytes]], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def bench(rows: int, creators: int, repeat: int) -> None:
+    news_list, contents = build_rows(rows, creators)
+
+    async def news_batch() -> bytes:
+        return render(serialize_news_list(news_list))
+
+    async def contents_batch() -> bytes:
+        return render(serialize_contents(contents))
+
+    cases = [
+        ("news     per-row to_pydantic", lambda: per_row(news_list, NEWS_ADAPTER)),
+        ("news     serialize_news_list", news_batch),
+        ("contents per-row to_pydantic", lambda: per_row(contents, CONTENTS_ADAPTER)),
+        ("contents serialize_contents ", contents_batch),
+    ]
+
+    print(f"rows={rows} creators={creators} best of {repeat}")
+    for label, run in cases:
+        elapsed = await timed(run, repeat)
+        print(f"{label}  {elapsed * 1000:8.1f}ms  {elapsed / rows * 1e6:6.2f}us/row")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="rows per list")
+    parser.add_argument("--creators", type=int, default=20, help="distinct users")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    args = parser.parse_args()
+    asyncio.run(bench(args.rows, args.creators, args.repeat))
@@ -0,0 +1,77 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, NamedTuple
+
+from fastapi import Request, Response, status
+
+
+class EncodedPayload(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def encode_payload(data: Any) -> EncodedPayload:
+    body = json.dumps(
+        data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    return EncodedPayload(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def validator_headers(key: str, last_modified: datetime) -> dict:
+    return {
+        "ETag": f'W/"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"',
+        "Last-Modified": format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        ),
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, headers: dict) -> bool:
+    if not headers:
+        return False
+
+    if "if-none-match" in request.headers:
+        return etag_matches(request, headers["ETag"])
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    return parsedate_to_datetime(headers["Last-Modified"]) <= since
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def conditional_response(
+    request: Request, payload: EncodedPayload, cache_control: str
+) -> Response:
+    headers = {"ETag": payload.etag, "Cache-Control": cache_control}
+
+    if etag_matches(request, payload.etag):
+        return not_modified_response(headers)
+
+    return Response(payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,153 @@
+"""Move existing media into the content-addressed blob store.
+
+Usage: python -m api.content.dedup [--workers N] [--dry-run]
+
+Files are hashed in parallel, each distinct sha256 is linked (or copied)
+once under media_root/blobs together with its image variants, contents
+are repointed and reference counted in one transaction, and the original
+files are removed after commit. Rows whose variants cannot be carried over
+are reset so that python -m api.content.images renders them again.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from ..database import async_session, engine
+from ..news.models import News  # noqa: F401  (registers the User.news mapper)
+from ..versions.queries import bump_table_version
+from .models import Content, MediaBlob
+from .storage import CHUNK_SIZE, IMAGE_VARIANTS, blob_path, blob_root, variant_path
+
+
+def hash_file(path: str) -> Optional[Tuple[int, str]]:
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                size += len(chunk)
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+
+    return size, digest.hexdigest()
+
+
+def place_blob(source: str, target: Path) -> None:
+    if target.exists():
+        return
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def place_variants(rows: list, target: Path) -> Optional[dict]:
+    """Copy the variants of the first row that has all of them on disk."""
+    for row in rows:
+        if row.variants is None:
+            continue
+
+        sources = [variant_path(row.path, name) for name in row.variants]
+        if all(source.exists() for source in sources):
+            for name, source in zip(row.variants, sources):
+                place_blob(str(source), variant_path(str(target), name))
+            return row.variants
+
+    return None
+
+
+def remove_files(path: str) -> None:
+    for name in (None, *IMAGE_VARIANTS):
+        try:
+            os.remove(path if name is None else variant_path(path, name))
+        except FileNotFoundError:
+            pass
+
+
+async def dedup(workers: int, dry_run: bool) -> None:
+    root = str(blob_root())
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(Content.id, Content.path, Content.variants)
+        )
+        contents = [row for row in result if not row.path.startswith(root)]
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            hashes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, hash_file, row.path)
+                    for row in contents
+                )
+            )
+
+        groups = defaultdict(list)
+        for row, hashed in zip(contents, hashes):
+            if hashed is None:
+                print(f"missing: content {row.id} {row.path}")
+                continue
+            groups[hashed].append(row)
+
+        reclaimable = sum(size * (len(rows) - 1) for (size, _), rows in groups.items())
+        print(
+            f"{len(contents)} files, {len(groups)} distinct, "
+            f"{reclaimable} bytes reclaimable"
+        )
+        if dry_run:
+            await engine.dispose()
+            return
+
+        for (size, sha256), rows in groups.items():
+            target = blob_path(sha256)
+            await loop.run_in_executor(None, place_blob, rows[0].path, target)
+            variants = await loop.run_in_executor(None, place_variants, rows, target)
+
+            await session.execute(
+                insert(MediaBlob)
+                .values(sha256=sha256, path=str(target), size=size, refcount=len(rows))
+                .on_conflict_do_update(
+                    index_elements=[MediaBlob.sha256],
+                    set_={"refcount": MediaBlob.refcount + len(rows)},
+                )
+            )
+            await session.execute(
+                update(Content)
+                .where(Content.id.in_([row.id for row in rows]))
+                .values(path=str(target), size=size, sha256=sha256, variants=variants)
+            )
+
+        await bump_table_version(session, "contents")
+        await session.commit()
+
+    for rows in groups.values():
+        for row in rows:
+            remove_files(row.path)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="hashing threads"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would be reclaimed"
+    )
+    args = parser.parse_args()
+    asyncio.run(dedup(args.workers, args.dry_run))
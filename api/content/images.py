@@ -0,0 +1,171 @@
+"""Thumbnails and resized WebP variants for gallery images.
+
+Usage: python -m api.content.images [--workers N] [--force]
+
+Variants are rendered in a process pool and written next to the original
+(``<file>.<variant>.webp``); their sizes are recorded in contents.variants.
+Run as a module to backfill gallery content that has no variants yet.
+"""
+
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import Image, ImageOps
+from sqlalchemy import select, update
+
+from config import config as conf
+from ..database import async_session, engine
+from ..news.models import News  # noqa: F401  (registers the User.news mapper)
+from ..response_cache import response_cache
+from ..versions.queries import bump_table_version
+from .models import Content, ContentCategory
+from .queries import CONTENTS_ALL_TAG, category_tag, content_tag
+from .storage import IMAGE_VARIANTS, variant_path
+
+WEBP_QUALITY = 80
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=conf.image_workers)
+
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def render_variants(path: str) -> dict:
+    variants = {}
+
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        for name, variant in IMAGE_VARIANTS.items():
+            if variant.crop:
+                side = min(variant.width, image.width, image.height)
+                resized = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+            elif image.width > variant.width:
+                height = max(round(image.height * variant.width / image.width), 1)
+                resized = image.resize(
+                    (variant.width, height), Image.Resampling.LANCZOS
+                )
+            else:
+                resized = image
+
+            target = variant_path(path, name)
+            temp_path = target.with_name(f".{target.name}.part")
+            resized.save(temp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+            os.replace(temp_path, target)
+
+            variants[name] = {
+                "width": resized.width,
+                "height": resized.height,
+                "size": target.stat().st_size,
+            }
+
+    return variants
+
+
+async def render(path: str, executor: ProcessPoolExecutor) -> Optional[dict]:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, render_variants, path)
+    except (OSError, Image.DecompressionBombError) as e:
+        print(f"cannot render variants for {path}: {e}")
+        return None
+
+
+async def generate_variants(content_id: int) -> None:
+    """Background task run after a gallery upload has been committed."""
+    # No session is held while rendering: a large image would otherwise keep
+    # a pooled connection idle in a transaction for the whole render.
+    async with async_session() as session:
+        result = await session.execute(
+            select(Content.path, Content.category).where(Content.id == content_id)
+        )
+        content = result.one_or_none()
+
+    if content is None or content.category != ContentCategory.GALLERY:
+        return
+
+    variants = await render(content.path, get_executor())
+    if variants is None:
+        return
+
+    async with async_session() as session:
+        await session.execute(
+            update(Content).where(Content.id == content_id).values(variants=variants)
+        )
+        await bump_table_version(session, "contents")
+        await session.commit()
+
+    await response_cache.invalidate(
+        CONTENTS_ALL_TAG,
+        category_tag(ContentCategory.GALLERY),
+        content_tag(content_id),
+    )
+
+
+async def backfill(workers: int, force: bool) -> None:
+    async with async_session() as session:
+        query = select(Content.id, Content.path).where(
+            Content.category == ContentCategory.GALLERY
+        )
+        if not force:
+            query = query.where(Content.variants.is_(None))
+        contents = (await session.execute(query)).all()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rendered = await asyncio.gather(
+            *(render(row.path, executor) for row in contents)
+        )
+
+    done = 0
+    async with async_session() as session:
+        for row, variants in zip(contents, rendered):
+            if variants is not None:
+                await session.execute(
+                    update(Content)
+                    .where(Content.id == row.id)
+                    .values(variants=variants)
+                )
+                done += 1
+
+        if done:
+            await bump_table_version(session, "contents")
+            await session.commit()
+
+    print(f"{done} of {len(contents)} gallery items rendered")
+    await response_cache.invalidate(
+        CONTENTS_ALL_TAG,
+        category_tag(ContentCategory.GALLERY),
+        *(content_tag(row.id) for row in contents),
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, default=conf.image_workers, help="render processes"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-render items that have variants"
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(args.workers, args.force))
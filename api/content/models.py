@@ -1,15 +1,22 @@
 from datetime import datetime
+from types import MappingProxyType
 
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Computed,
     Integer,
     String,
+    Text,
     ForeignKey,
     DateTime,
     Boolean,
     Enum,
+    Index,
     UniqueConstraint,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import relationship
 
 from ..user.models import Base, BaseEnum
@@ -30,25 +37,30 @@ class ContentCategory(BaseEnum):
 
     @staticmethod
     async def get_category_names() -> dict:
-        category_names = {
-            ContentCategory.REGULATORY_DOCUMENT: "Нормативный документ",
-            ContentCategory.DOCUMENT_FOR_MILITARY_REGISTRATION: "Документ для воинского учета",
-            ContentCategory.ALTERNATIVE_CIVILIAN_SERVICE_DOCUMENT: "Документ альтернативной гражданской службы",
-            ContentCategory.CONTRACT_SERVICE_DOCUMENT: "Документ контрактной службы",
-            ContentCategory.STUDENTS: "Студенты",
-            ContentCategory.GALLERY: "Галерея",
-            ContentCategory.PATRIOTIC_EDUCATION: "Патриотическое воспитание",
-            ContentCategory.EVENTS: "События",
-            ContentCategory.MILITARY_TRAINING_CAMPS: "Военные сборы",
-            ContentCategory.ADDRESS_AND_LINKS: "Адреса и ссылки",
-            ContentCategory.CONTACTS: "Контакты",
-        }
-        return category_names
+        return CATEGORY_NAMES
 
     @staticmethod
     async def get_category_name(category: "ContentCategory") -> str:
-        category_names = await ContentCategory.get_category_names()
-        return category_names.get(category, category.value)
+        return CATEGORY_NAMES.get(category, category.value)
+
+
+CATEGORY_NAMES = MappingProxyType(
+    {
+        ContentCategory.REGULATORY_DOCUMENT: "Нормативный документ",
+        ContentCategory.DOCUMENT_FOR_MILITARY_REGISTRATION: "Документ для воинского учета",
+        ContentCategory.ALTERNATIVE_CIVILIAN_SERVICE_DOCUMENT: "Документ альтернативной гражданской службы",
+        ContentCategory.CONTRACT_SERVICE_DOCUMENT: "Документ контрактной службы",
+        ContentCategory.STUDENTS: "Студенты",
+        ContentCategory.GALLERY: "Галерея",
+        ContentCategory.PATRIOTIC_EDUCATION: "Патриотическое воспитание",
+        ContentCategory.EVENTS: "События",
+        ContentCategory.MILITARY_TRAINING_CAMPS: "Военные сборы",
+        ContentCategory.ADDRESS_AND_LINKS: "Адреса и ссылки",
+        ContentCategory.CONTACTS: "Контакты",
+    }
+)
+
+TEXT_SEARCH_CONFIG = "russian"
 
 
 class Content(Base):
@@ -56,9 +68,12 @@ class Content(Base):
 
     id = Column(Integer, primary_key=True)
     filename = Column(String(256), nullable=False)
-    path = Column(String(256), nullable=False, unique=True)
+    path = Column(String(256), nullable=False)
     extension = Column(String(7), nullable=False)
-    creator_id = Column(Integer, ForeignKey("users.id"))
+    size = Column(BigInteger, default=None)
+    sha256 = Column(String(64), default=None)
+    variants = Column(JSONB, default=None)
+    creator_id = Column(Integer, ForeignKey("users.id"), index=True)
     category = Column(Enum(ContentCategory), nullable=False)
     is_archived = Column(Boolean, default=False)
     created_at = Column(DateTime, nullable=False, default=datetime.now)
@@ -68,8 +83,35 @@ class Content(Base):
 
     __table_args__ = (
         UniqueConstraint("filename", "category", name="_filename_category_uc"),
+        Index("ix_contents_category_is_archived", "category", "is_archived"),
+        Index(
+            "ix_contents_active_category_created_at",
+            "category",
+            "created_at",
+            "id",
+            postgresql_where=text("is_archived = false"),
+        ),
     )
 
+    @property
+    def url(self) -> str:
+        url = f"/media/content/{self.id}"
+        return f"{url}?v={self.sha256}" if self.sha256 else url
+
+    @property
+    def variant_urls(self):
+        if not self.variants:
+            return None
+
+        return {
+            name: {
+                "url": f"/media/content/{self.id}/{name}?v={self.sha256}",
+                "width": variant["width"],
+                "height": variant["height"],
+            }
+            for name, variant in self.variants.items()
+        }
+
     async def archive(self):
         self.is_archived = True
         self.last_updated_at = datetime.now()
@@ -85,6 +127,8 @@ class Content(Base):
             "filename": self.filename,
             "extension": self.extension,
             "path": self.path,
+            "url": self.url,
+            "variants": self.variant_urls,
             "category": await ContentCategory.get_category_name(self.category),
             "creator": await self.creator.to_base_user(),
             "is_archived": self.is_archived,
@@ -95,3 +139,30 @@ class Content(Base):
                 else None
             ),
         }
+
+
+class MediaBlob(Base):
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(256), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    refcount = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class ContentText(Base):
+    __tablename__ = "content_texts"
+
+    content_id = Column(
+        Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True
+    )
+    body = Column(Text, nullable=False)
+    document = Column(
+        TSVECTOR, Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', body)", persisted=True)
+    )
+    extracted_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_content_texts_document", "document", postgresql_using="gin"),
+    )
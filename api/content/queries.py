@@ -1,32 +1,115 @@
+import asyncio
 from datetime import datetime
+from types import MappingProxyType
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import UploadFile, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, asc, desc, tuple_
+from sqlalchemy.orm import aliased, contains_eager, joinedload, selectinload
 from sqlalchemy.sql import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..user.validator import user_exists_by_username
-
 from config import config as conf
-from .models import Content, ContentCategory
+from ..cache import TTLCache
+from ..conditional import EncodedPayload, encode_payload
+from ..fields import parse_fields, load_fields, wants
+from ..pagination import encode_cursor, decode_cursor
+from ..response_cache import response_cache, cache_key
+from ..search import HEADLINE_OPTIONS, render_headline
+from ..user.models import User
+from ..versions.queries import bump_table_version
+from .models import (
+    Content,
+    ContentCategory,
+    ContentText,
+    CATEGORY_NAMES,
+    TEXT_SEARCH_CONFIG,
+)
 from .schemes import (
     NewContent,
     ContentResponse,
+    ContentSort,
     GetContentFilters,
+    ContentSearchFilters,
     ContentUpdateRequest,
 )
-from .validator import CreateContentValidator, UpdateContentValidator
+from .serializers import CONTENT_COLUMNS, CONTENT_FIELDS, serialize_contents
+from .storage import (
+    blob_root,
+    discard,
+    discard_blob,
+    link_blob,
+    release_blob,
+    store_blob,
+    stream_to_temp,
+    stream_upload,
+)
+from .suggest import filename_index
+from .validator import (
+    CreateContentValidator,
+    CreateContentBatchValidator,
+    UpdateContentValidator,
+    get_max_file_size,
+)
+
+SORT_COLUMNS = {
+    ContentSort.CREATED_AT: Content.created_at,
+    ContentSort.LAST_UPDATED_AT: func.coalesce(
+        Content.last_updated_at, Content.created_at
+    ),
+    ContentSort.FILENAME: Content.filename,
+}
+
+CURSOR_COLUMNS = {
+    ContentSort.CREATED_AT: [Content.created_at],
+    ContentSort.LAST_UPDATED_AT: [Content.last_updated_at, Content.created_at],
+    ContentSort.FILENAME: [Content.filename],
+}
+
+content_counts = TTLCache(1024, conf.content_count_cache_ttl)
+
+CONTENTS_ALL_TAG = "contents:all"
+
+
+def category_tag(category: ContentCategory) -> str:
+    return f"contents:{category.value}"
+
+
+def content_tag(content_id: int) -> str:
+    return f"content:{content_id}"
+
+
+CATEGORY_CATALOG = encode_payload(
+    {category.value: name for category, name in CATEGORY_NAMES.items()}
+)
+CATEGORY_LABELS = MappingProxyType(
+    {category.value: encode_payload(name) for category, name in CATEGORY_NAMES.items()}
+)
+
 
+async def get_categories() -> EncodedPayload:
+    return CATEGORY_CATALOG
 
-async def get_categories() -> dict:
-    return await ContentCategory.get_category_names()
 
+async def get_category(category_name: str) -> EncodedPayload:
+    payload = CATEGORY_LABELS.get(category_name)
+
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid category: {category_name}",
+        )
 
-async def get_category(category_name: str) -> str:
-    return await ContentCategory.get_category_name(ContentCategory(category_name))
+    return payload
+
+
+def content_file_path(
+    category: ContentCategory, user_folder: str, filename: str, extension: str
+) -> Path:
+    return (
+        Path(conf.media_root) / category.value / user_folder / f"{filename}{extension}"
+    )
 
 
 async def upload_content(
@@ -35,7 +118,7 @@ async def upload_content(
     user_folder: str,
     category: ContentCategory,
     filename: str,
-) -> Tuple[str, str]:
+) -> Tuple[str, str, int, str]:
     original_extension = Path(file.filename).suffix
     validator = CreateContentValidator(
         filename=filename,
@@ -45,16 +128,16 @@ async def upload_content(
     )
     await validator.validate()
 
-    media_root = Path(conf.media_root)
-    save_path = media_root / category.value / user_folder
-    save_path.mkdir(parents=True, exist_ok=True)
+    max_size = get_max_file_size(category)
 
-    file_path = save_path / f"{filename}{original_extension}"
+    if conf.media_storage == "content_addressed":
+        path, size, sha256 = await store_blob(session, file, max_size)
+        return path, original_extension, size, sha256
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    file_path = content_file_path(category, user_folder, filename, original_extension)
+    size, sha256 = await stream_upload(file, file_path, max_size)
 
-    return str(file_path), original_extension
+    return str(file_path), original_extension, size, sha256
 
 
 async def create_content(
@@ -63,7 +146,7 @@ async def create_content(
     current_user_username: str,
     new_content: NewContent,
 ) -> Content:
-    path, extension = await upload_content(
+    path, extension, size, sha256 = await upload_content(
         session,
         new_content.file,
         current_user_username,
@@ -76,59 +159,369 @@ async def create_content(
         category=new_content.category,
         path=path,
         extension=extension,
+        size=size,
+        sha256=sha256,
         creator_id=current_user_id,
     )
 
     session.add(content)
+    await bump_table_version(session, "contents")
     await session.commit()
-    await session.refresh(content)
+    await session.refresh(content, ["creator"])
+    content_counts.clear()
+    filename_index.add(content.category, content.id, content.filename)
+    await response_cache.invalidate(CONTENTS_ALL_TAG, category_tag(content.category))
 
     return content
 
 
-async def get_contents(
-    session: AsyncSession, filters: GetContentFilters
-) -> List[ContentResponse]:
-    query = (
-        select(Content)
-        .options(selectinload(Content.creator))
-        .where(Content.is_archived == filters.archived)
+async def create_contents(
+    session: AsyncSession,
+    current_user_id: int,
+    current_user_username: str,
+    category: ContentCategory,
+    files: List[UploadFile],
+    filenames: Optional[List[str]] = None,
+) -> Tuple[List[dict], List[Content]]:
+    if filenames is None:
+        filenames = [Path(file.filename).stem for file in files]
+    if len(filenames) != len(files):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="filenames must have one entry per file",
+        )
+
+    extensions = [Path(file.filename).suffix for file in files]
+    validator = CreateContentBatchValidator(
+        filenames, [extension[1:] for extension in extensions], category, session
     )
+    errors = await validator.validate()
+
+    results = [
+        {"file": file.filename, "filename": filename, "status_code": 201}
+        for file, filename in zip(files, filenames)
+    ]
+    for result, error in zip(results, errors):
+        if error is not None:
+            result.update(status_code=error.status_code, detail=error.detail)
+
+    max_size = get_max_file_size(category)
+    content_addressed = conf.media_storage == "content_addressed"
+    semaphore = asyncio.Semaphore(conf.batch_upload_concurrency)
+
+    async def store(index: int) -> Tuple[Path, int, str]:
+        async with semaphore:
+            if content_addressed:
+                return await stream_to_temp(files[index], blob_root(), max_size)
+
+            path = content_file_path(
+                category, current_user_username, filenames[index], extensions[index]
+            )
+            size, sha256 = await stream_upload(files[index], path, max_size)
+            return path, size, sha256
+
+    pending = [index for index, error in enumerate(errors) if error is None]
+    stored = await asyncio.gather(
+        *(store(index) for index in pending), return_exceptions=True
+    )
+
+    written = [item[0] for item in stored if not isinstance(item, BaseException)]
+    created_blobs: List[Tuple[str, str]] = []
+    created: Dict[int, Content] = {}
+    try:
+        for index, item in zip(pending, stored):
+            if isinstance(item, HTTPException):
+                results[index].update(status_code=item.status_code, detail=item.detail)
+                continue
+            if isinstance(item, BaseException):
+                raise item
+
+            path, size, sha256 = item
+            if content_addressed:
+                path, created_blob = await link_blob(session, path, size, sha256)
+                if created_blob:
+                    created_blobs.append((sha256, path))
+
+            created[index] = Content(
+                filename=filenames[index],
+                category=category,
+                path=str(path),
+                extension=extensions[index],
+                size=size,
+                sha256=sha256,
+                creator_id=current_user_id,
+            )
+
+        if created:
+            session.add_all(created.values())
+            await bump_table_version(session, "contents")
+            await session.commit()
+    except BaseException:
+        await session.rollback()
+        for path in written:
+            await discard(Path(path))
+        for sha256, path in created_blobs:
+            await discard_blob(session, sha256, path)
+        raise
+
+    contents = list(created.values())
+    if contents:
+        result = await session.execute(
+            select(Content)
+            .options(joinedload(Content.creator))
+            .where(Content.id.in_([content.id for content in contents]))
+        )
+        payloads = {
+            payload["id"]: payload
+            for payload in serialize_contents(result.scalars().unique().all())
+        }
+        for index, content in created.items():
+            results[index]["content"] = payloads[content.id]
 
-    conditions = []
+        content_counts.clear()
+        for content in contents:
+            filename_index.add(content.category, content.id, content.filename)
+        await response_cache.invalidate(CONTENTS_ALL_TAG, category_tag(category))
+
+    return results, contents
+
+
+def filter_conditions(model, filters: GetContentFilters) -> list:
+    conditions = [model.is_archived == filters.archived]
     if filters.category:
-        if filters.category not in ContentCategory:
+        conditions.append(model.category == filters.category)
+    if filters.extension:
+        conditions.append(model.extension == f".{filters.extension.lstrip('.')}")
+    if filters.created_from:
+        conditions.append(model.created_at >= filters.created_from)
+    if filters.created_to:
+        conditions.append(model.created_at <= filters.created_to)
+    return conditions
+
+
+def count_query(filters: GetContentFilters):
+    counted = aliased(Content)
+    query = (
+        select(func.count())
+        .select_from(counted)
+        .where(and_(*filter_conditions(counted, filters)))
+    )
+    if filters.creator:
+        query = query.join(User, User.id == counted.creator_id).where(
+            User.username == filters.creator
+        )
+    return query.correlate(None)
+
+
+def count_key(filters: GetContentFilters) -> tuple:
+    return (
+        filters.archived,
+        filters.category,
+        filters.creator,
+        filters.extension,
+        filters.created_from,
+        filters.created_to,
+    )
+
+
+async def count_contents(session: AsyncSession, filters: GetContentFilters) -> int:
+    key = count_key(filters)
+    total = content_counts.get(key)
+
+    if total is None:
+        result = await session.execute(count_query(filters))
+        total = result.scalar()
+        content_counts.set(key, total)
+
+    return total
+
+
+async def get_contents(
+    session: AsyncSession, filters: GetContentFilters, version: Optional[int] = None
+) -> Tuple[List[dict], Optional[str], int]:
+    if filters.category and filters.category not in ContentCategory:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid category: {filters.category}",
+        )
+
+    fields = parse_fields(filters.fields, CONTENT_FIELDS)
+    params = filters.model_dump(mode="json")
+    params["extension"] = filters.extension and filters.extension.lstrip(".")
+    params["fields"] = sorted(fields or [])
+
+    return await response_cache.get_or_load(
+        cache_key("contents", **params, version=version),
+        [category_tag(filters.category) if filters.category else CONTENTS_ALL_TAG],
+        lambda: fetch_contents(session, filters, fields),
+    )
+
+
+async def fetch_contents(
+    session: AsyncSession, filters: GetContentFilters, fields: Optional[List[str]]
+) -> Tuple[List[dict], Optional[str], int]:
+    options = load_fields(
+        CONTENT_COLUMNS, fields, Content.id, *CURSOR_COLUMNS[filters.sort]
+    )
+    conditions = filter_conditions(Content, filters)
+    sort_column = SORT_COLUMNS[filters.sort]
+    order = desc if filters.descending else asc
+
+    if filters.after:
+        sort, descending, value, content_id = decode_cursor(filters.after, 4)
+        if sort != filters.sort.value or descending != filters.descending:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=f"Invalid category: {filters.category}",
+                detail="cursor does not match the requested sort",
             )
-        conditions.append(Content.category == filters.category)
-    if filters.creator:
-        await user_exists_by_username(session, filters.creator)
-        conditions.append(Content.creator.has(username=filters.creator))
+        try:
+            if filters.sort != ContentSort.FILENAME:
+                value = datetime.fromisoformat(value)
+            bound = (value, int(content_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="invalid cursor",
+            )
+        key = tuple_(sort_column, Content.id)
+        conditions.append(key < bound if filters.descending else key > bound)
 
-    if conditions:
-        query = query.where(and_(*conditions))
+    total = content_counts.get(count_key(filters))
+    columns = [Content]
+    if total is None:
+        columns.append(count_query(filters).scalar_subquery().label("total"))
 
+    if filters.creator:
+        # One statement for the user check, the filter and the creator:
+        # the user row comes back with NULL content when nothing matches.
+        query = (
+            select(*columns)
+            .select_from(User)
+            .outerjoin(Content, and_(Content.creator_id == User.id, *conditions))
+            .where(User.username == filters.creator)
+        )
+        if wants(fields, "creator"):
+            options.append(contains_eager(Content.creator))
+    else:
+        query = select(*columns).where(and_(*conditions))
+        if wants(fields, "creator"):
+            options.append(joinedload(Content.creator))
+
+    query = (
+        query.options(*options)
+        .order_by(order(sort_column), order(Content.id))
+        .limit(filters.limit + 1)
+    )
     result = await session.execute(query)
+    rows = result.all()
+
+    if filters.creator and not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User with username '{filters.creator}' does not exist.",
+        )
 
-    contents = result.scalars().all()
+    if total is None and rows:
+        total = rows[0].total
+        content_counts.set(count_key(filters), total)
 
-    if not contents:
+    contents = [row[0] for row in rows if row[0] is not None]
+
+    if not contents and not filters.after:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="No content found"
         )
 
-    contents = [await content.to_pydantic() for content in contents]
-    return contents
+    if total is None:
+        total = await count_contents(session, filters)
+
+    next_cursor = None
+    if len(contents) > filters.limit:
+        contents = contents[: filters.limit]
+        last = contents[-1]
+        if filters.sort == ContentSort.FILENAME:
+            last_value = last.filename
+        elif filters.sort == ContentSort.LAST_UPDATED_AT:
+            last_value = last.last_updated_at or last.created_at
+        else:
+            last_value = last.created_at
+        next_cursor = encode_cursor(
+            filters.sort.value, filters.descending, last_value, last.id
+        )
 
+    return serialize_contents(contents, fields), next_cursor, total
 
-async def get_content(session: AsyncSession, content_id: int) -> Content:
-    query = (
-        select(Content)
-        .where(Content.id == content_id)
-        .options(selectinload(Content.creator))
+
+async def search_contents(
+    session: AsyncSession, filters: ContentSearchFilters
+) -> Tuple[List[dict], int]:
+    query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, filters.q)
+    conditions = [
+        ContentText.document.op("@@")(query),
+        Content.is_archived == filters.archived,
+    ]
+    if filters.category:
+        conditions.append(Content.category == filters.category)
+
+    # Rank and page on the index first; headlines are built for the page only.
+    page = (
+        select(
+            ContentText.content_id,
+            func.ts_rank_cd(ContentText.document, query).label("rank"),
+            func.count().over().label("total"),
+        )
+        .join(Content, Content.id == ContentText.content_id)
+        .where(*conditions)
+        .order_by(desc("rank"), desc(ContentText.content_id))
+        .offset(filters.skip)
+        .limit(filters.limit)
+        .subquery()
+    )
+    result = await session.execute(
+        select(
+            Content,
+            page.c.rank,
+            page.c.total,
+            func.ts_headline(
+                TEXT_SEARCH_CONFIG, ContentText.body, query, HEADLINE_OPTIONS
+            ).label("headline"),
+        )
+        .join(page, page.c.content_id == Content.id)
+        .join(ContentText, ContentText.content_id == Content.id)
+        .options(joinedload(Content.creator))
+        .order_by(desc(page.c.rank), desc(Content.id))
     )
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif filters.skip:
+        result = await session.execute(
+            select(func.count())
+            .select_from(ContentText)
+            .join(Content, Content.id == ContentText.content_id)
+            .where(*conditions)
+        )
+        total = result.scalar()
+    else:
+        total = 0
+
+    contents = serialize_contents([row.Content for row in rows])
+    for content, row in zip(contents, rows):
+        content["rank"] = round(row.rank, 4)
+        content["highlight"] = render_headline(row.headline)
+
+    return contents, total
+
+
+async def get_content(
+    session: AsyncSession, content_id: int, fields: Optional[List[str]] = None
+) -> Content:
+    options = load_fields(CONTENT_COLUMNS, fields, Content.id)
+    if wants(fields, "creator"):
+        options.append(selectinload(Content.creator))
+
+    query = select(Content).where(Content.id == content_id).options(*options)
     result = await session.execute(query)
     content = result.scalar()
 
@@ -140,6 +533,25 @@ async def get_content(session: AsyncSession, content_id: int) -> Content:
     return content
 
 
+async def get_content_payload(
+    session: AsyncSession,
+    content_id: int,
+    fields: Optional[List[str]] = None,
+    version: Optional[int] = None,
+) -> dict:
+    async def fetch_content_payload() -> dict:
+        content = await get_content(session, content_id, fields)
+        return serialize_contents([content], fields)[0]
+
+    return await response_cache.get_or_load(
+        cache_key(
+            "content", id=content_id, fields=sorted(fields or []), version=version
+        ),
+        [content_tag(content_id)],
+        fetch_content_payload,
+    )
+
+
 async def update_content(
     session: AsyncSession, content_id: int, update_data: ContentUpdateRequest
 ) -> ContentResponse:
@@ -159,6 +571,9 @@ async def update_content(
     await validator.validate()
 
     content = await get_content(session, content_id)
+    old_category = content.category
+    old_filename = content.filename
+    was_archived = content.is_archived
 
     if update_data.filename:
         content.filename = update_data.filename
@@ -171,11 +586,32 @@ async def update_content(
             await content.unarchived()
     content.last_updated_at = datetime.now()
 
+    await bump_table_version(session, "contents")
     await session.commit()
+    content_counts.clear()
+    if not was_archived:
+        filename_index.remove(old_category, content_id, old_filename)
+    if not content.is_archived:
+        filename_index.add(content.category, content_id, content.filename)
+    await response_cache.invalidate(
+        CONTENTS_ALL_TAG,
+        category_tag(old_category),
+        category_tag(content.category),
+        content_tag(content_id),
+    )
     return await content.to_pydantic()
 
 
 async def delete_content(session: AsyncSession, content_id: int):
     content = await get_content(session, content_id)
     await session.delete(content)
+    released = await release_blob(session, content.sha256, content.path)
+    await bump_table_version(session, "contents")
     await session.commit()
+    if released is not None:
+        await discard_blob(session, content.sha256, released)
+    content_counts.clear()
+    filename_index.remove(content.category, content_id, content.filename)
+    await response_cache.invalidate(
+        CONTENTS_ALL_TAG, category_tag(content.category), content_tag(content_id)
+    )
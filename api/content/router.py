@@ -1,36 +1,163 @@
-from typing import List
-from fastapi import Depends, APIRouter
+from typing import List, Optional, Tuple
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    APIRouter,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.types import Message, Receive
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from config import config as conf
+from ..conditional import (
+    conditional_response,
+    is_not_modified,
+    not_modified_response,
+)
+from ..fields import parse_fields
+from ..versions.queries import table_validators
+from ..database import get_session, get_read_session
 from ..auth.middleware import get_current_user
 from ..user.middleware import role_checker
 from ..user.models import User, Role
 
+from .images import generate_variants
+from .suggest import filename_index, refresh_filename_index
+from .texts import TEXT_EXTENSIONS, index_content_text
+from .models import ContentCategory
 from .schemes import (
     NewContent,
     ContentResponse,
     GetContentFilters,
+    ContentBatchResult,
+    ContentSearchFilters,
+    ContentSearchResult,
+    ContentSuggestion,
     ContentUpdateRequest,
 )
+from .serializers import CONTENT_FIELDS
+from .storage import file_too_large
+from .validator import MAX_FILE_SIZES, get_max_file_size
 from . import queries as qr
 
+CATALOG_CACHE_CONTROL = f"public, max-age={conf.catalog_cache_max_age}"
+
+# Room for multipart boundaries, part headers and the other form fields.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadRoute(APIRoute):
+    """Rejects an oversized upload before the form is parsed.
+
+    FastAPI receives and spools the whole multipart body before any
+    dependency runs, so the size check in stream_to_temp alone would only
+    fire after an oversized file had already been read. A declared
+    Content-Length is checked up front; the body itself is counted as it
+    arrives, which also covers chunked requests. Routes without file
+    parameters are left alone.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        annotations = [
+            field.field_info.annotation
+            for field in get_flat_dependant(self.dependant).body_params
+        ]
+        if List[UploadFile] in annotations:
+            request_limit = batch_upload_limit
+        elif UploadFile in annotations:
+            request_limit = upload_limit
+        else:
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            limit, error = request_limit(request)
+            content_length = request.headers.get("content-length")
+            if content_length and content_length.isdigit():
+                if int(content_length) > limit:
+                    raise error
+
+            return await handler(
+                Request(request.scope, limit_body(request.receive, limit, error))
+            )
+
+        return route_handler
+
+
+def upload_limit(request: Request) -> Tuple[int, HTTPException]:
+    try:
+        category = ContentCategory(request.query_params["category"])
+        max_size = get_max_file_size(category)
+    except (KeyError, ValueError):
+        # A missing or unknown category is rejected once the route validates.
+        max_size = max(MAX_FILE_SIZES.values())
+
+    return max_size + MULTIPART_OVERHEAD, file_too_large(max_size)
+
+
+def batch_upload_limit(request: Request) -> Tuple[int, HTTPException]:
+    # The category of a batch arrives inside the form itself, so the whole
+    # request is capped instead; stream_to_temp still enforces the per-file
+    # limit of the category.
+    max_size = conf.batch_upload_max_size
+    return max_size, HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload is too large. Maximum size is {max_size // (1024 * 1024)} MB",
+    )
+
+
+def limit_body(receive: Receive, limit: int, error: HTTPException) -> Receive:
+    received = 0
+
+    async def limited_receive() -> Message:
+        nonlocal received
+
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise error
+
+        return message
+
+    return limited_receive
 
-router = APIRouter(prefix="/content")
+
+router = APIRouter(prefix="/content", route_class=UploadRoute)
 
 
 @router.get("/categories", response_model=dict)
-async def get_categories():
-    return await qr.get_categories()
+async def get_categories(request: Request):
+    payload = await qr.get_categories()
+    return conditional_response(request, payload, CATALOG_CACHE_CONTROL)
 
 
 @router.get("/category/{name}", response_model=str)
-async def get_category(name: str):
-    return await qr.get_category(name)
+async def get_category(request: Request, name: str):
+    payload = await qr.get_category(name)
+    return conditional_response(request, payload, CATALOG_CACHE_CONTROL)
+
+
+def schedule_processing(background_tasks: BackgroundTasks, content) -> None:
+    if content.category == ContentCategory.GALLERY:
+        background_tasks.add_task(generate_variants, content.id)
+    if content.extension.lower() in TEXT_EXTENSIONS:
+        background_tasks.add_task(index_content_text, content.id)
 
 
 @router.post("/upload", response_model=ContentResponse)
 async def upload_content(
+    background_tasks: BackgroundTasks,
     new_content: NewContent = Depends(),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
@@ -40,25 +167,91 @@ async def upload_content(
     new_content = await qr.create_content(
         session, current_user.id, current_user.username, new_content
     )
+    schedule_processing(background_tasks, new_content)
     return await new_content.to_pydantic()
 
 
+@router.post("/upload_batch", response_model=List[ContentBatchResult])
+async def upload_contents(
+    background_tasks: BackgroundTasks,
+    category: ContentCategory = Form(...),
+    files: List[UploadFile] = File(...),
+    filenames: Optional[List[str]] = Form(None),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    await role_checker(current_user, [Role.ADMIN], "only admin can upload content")
+    if len(files) > conf.batch_upload_max_files:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {conf.batch_upload_max_files} files per upload",
+        )
+
+    results, contents = await qr.create_contents(
+        session,
+        current_user.id,
+        current_user.username,
+        category,
+        files,
+        filenames,
+    )
+    for content in contents:
+        schedule_processing(background_tasks, content)
+    return JSONResponse(results)
+
+
 @router.get("s/", response_model=List[ContentResponse])
 async def get_contents(
+    request: Request,
     filters: GetContentFilters = Depends(),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
+):
+    version, headers = await table_validators(session, request, "contents")
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    contents, next_cursor, total = await qr.get_contents(session, filters, version)
+    headers["X-Total-Count"] = str(total)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return JSONResponse(contents, headers=headers)
+
+
+@router.get("/search", response_model=List[ContentSearchResult])
+async def search_contents(
+    filters: ContentSearchFilters = Depends(),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    contents = await qr.get_contents(session, filters)
-    return contents
+    contents, total = await qr.search_contents(session, filters)
+    return JSONResponse(contents, headers={"X-Total-Count": str(total)})
+
+
+@router.get("/suggest", response_model=List[ContentSuggestion])
+async def suggest_filenames(
+    background_tasks: BackgroundTasks,
+    prefix: str = Query(..., min_length=1, max_length=50),
+    category: Optional[ContentCategory] = None,
+    limit: int = Query(10, ge=1, le=50),
+):
+    if filename_index.is_stale(conf.suggest_index_ttl):
+        background_tasks.add_task(refresh_filename_index)
+    return JSONResponse(filename_index.suggest(prefix, category, limit))
 
 
 @router.get("/{content_id}", response_model=ContentResponse)
 async def get_content(
+    request: Request,
     content_id: int,
-    session: AsyncSession = Depends(get_session),
+    fields: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
 ):
-    content = await qr.get_content(session, content_id)
-    return await content.to_pydantic()
+    fields = parse_fields(fields, CONTENT_FIELDS)
+    version, headers = await table_validators(session, request, "contents")
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    content = await qr.get_content_payload(session, content_id, fields, version)
+    return JSONResponse(content, headers=headers)
 
 
 @router.patch("/{content_id}", response_model=ContentResponse)
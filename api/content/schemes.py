@@ -1,8 +1,18 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Dict, Optional, List
 from fastapi import UploadFile, Form
+from pydantic import Field
 
 from ..user.schemes import BaseModel, ID, BaseUser
-from .models import ContentCategory
+from .models import BaseEnum, ContentCategory
+
+MAX_PAGE_SIZE = 100
+
+
+class ContentSort(BaseEnum):
+    CREATED_AT = "created_at"
+    LAST_UPDATED_AT = "last_updated_at"
+    FILENAME = "filename"
 
 
 class NewContent(BaseModel):
@@ -11,10 +21,18 @@ class NewContent(BaseModel):
     file: UploadFile = (Form(...),)
 
 
+class ImageVariantResponse(BaseModel):
+    url: str
+    width: int
+    height: int
+
+
 class ContentResponse(ID):
     filename: str
     extension: str
     path: str
+    url: str
+    variants: Optional[Dict[str, ImageVariantResponse]] = None
     category: str
     creator: BaseUser
     is_archived: bool
@@ -26,6 +44,40 @@ class GetContentFilters(BaseModel):
     category: Optional[ContentCategory] = None
     creator: Optional[str] = None
     archived: bool = False
+    extension: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    sort: ContentSort = ContentSort.CREATED_AT
+    descending: bool = True
+    limit: int = Field(50, ge=1, le=MAX_PAGE_SIZE)
+    after: Optional[str] = None
+    fields: Optional[str] = None
+
+
+class ContentSearchFilters(BaseModel):
+    q: str = Field(..., min_length=2, max_length=200)
+    category: Optional[ContentCategory] = None
+    archived: bool = False
+    skip: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=MAX_PAGE_SIZE)
+
+
+class ContentSearchResult(ContentResponse):
+    rank: float
+    highlight: str
+
+
+class ContentSuggestion(ID):
+    filename: str
+    category: str
+
+
+class ContentBatchResult(BaseModel):
+    file: Optional[str]
+    filename: str
+    status_code: int
+    detail: Optional[str] = None
+    content: Optional[ContentResponse] = None
 
 
 class ContentUpdateRequest(BaseModel):
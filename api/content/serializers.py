@@ -0,0 +1,55 @@
+from typing import Iterable, List, Optional
+
+from ..user.serializers import serialize_creator
+from .models import Content, CATEGORY_NAMES
+
+DATE_FORMAT = "%H:%M %d.%m.%Y"
+
+CONTENT_FIELDS = {
+    "id": lambda content, creators: content.id,
+    "filename": lambda content, creators: content.filename,
+    "extension": lambda content, creators: content.extension,
+    "path": lambda content, creators: content.path,
+    "url": lambda content, creators: content.url,
+    "variants": lambda content, creators: content.variant_urls,
+    "category": lambda content, creators: CATEGORY_NAMES.get(
+        content.category, content.category.value
+    ),
+    "creator": lambda content, creators: serialize_creator(content.creator, creators),
+    "is_archived": lambda content, creators: content.is_archived,
+    "created_at": lambda content, creators: content.created_at.strftime(DATE_FORMAT),
+    "last_updated_at": lambda content, creators: (
+        content.last_updated_at.strftime(DATE_FORMAT)
+        if content.last_updated_at
+        else None
+    ),
+}
+
+CONTENT_COLUMNS = {
+    "id": [Content.id],
+    "filename": [Content.filename],
+    "extension": [Content.extension],
+    "path": [Content.path],
+    "url": [Content.id, Content.sha256],
+    "variants": [Content.id, Content.sha256, Content.variants],
+    "category": [Content.category],
+    "creator": [Content.creator_id],
+    "is_archived": [Content.is_archived],
+    "created_at": [Content.created_at],
+    "last_updated_at": [Content.last_updated_at],
+}
+
+
+def serialize_contents(
+    contents: Iterable[Content], fields: Optional[List[str]] = None
+) -> List[dict]:
+    creators = {}
+    getters = [
+        (field, get)
+        for field, get in CONTENT_FIELDS.items()
+        if fields is None or field in fields
+    ]
+    return [
+        {field: get(content, creators) for field, get in getters}
+        for content in contents
+    ]
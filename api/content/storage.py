@@ -0,0 +1,185 @@
+import hashlib
+import uuid
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile, HTTPException, status
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import config as conf
+from .models import MediaBlob
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ImageVariant(NamedTuple):
+    width: int
+    crop: bool
+
+
+IMAGE_VARIANTS = {
+    "thumb": ImageVariant(320, crop=True),
+    "small": ImageVariant(640, crop=False),
+    "medium": ImageVariant(1280, crop=False),
+}
+
+
+def blob_root() -> Path:
+    return Path(conf.media_root) / "blobs"
+
+
+def blob_path(sha256: str) -> Path:
+    return blob_root() / sha256[:2] / sha256[2:4] / sha256
+
+
+def variant_path(path: str, name: str) -> Path:
+    path = Path(path)
+    return path.with_name(f"{path.name}.{name}.webp")
+
+
+async def stream_to_temp(
+    file: UploadFile, directory: Path, max_size: int
+) -> Tuple[Path, int, str]:
+    """Copy an upload into a temp file in ``directory``, hashing as it streams."""
+    if file.size is not None and file.size > max_size:
+        raise file_too_large(max_size)
+
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    temp_path = directory / f".{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise file_too_large(max_size)
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        await discard(temp_path)
+        raise
+
+    return temp_path, size, digest.hexdigest()
+
+
+async def stream_upload(
+    file: UploadFile, target: Path, max_size: int
+) -> Tuple[int, str]:
+    temp_path, size, sha256 = await stream_to_temp(file, target.parent, max_size)
+
+    try:
+        await aiofiles.os.replace(temp_path, target)
+    except BaseException:
+        await discard(temp_path)
+        raise
+
+    return size, sha256
+
+
+async def store_blob(
+    session: AsyncSession, file: UploadFile, max_size: int
+) -> Tuple[str, int, str]:
+    """Store an upload once per sha256 and take a reference on it."""
+    temp_path, size, sha256 = await stream_to_temp(file, blob_root(), max_size)
+    path, _ = await link_blob(session, temp_path, size, sha256)
+    return path, size, sha256
+
+
+async def link_blob(
+    session: AsyncSession, temp_path: Path, size: int, sha256: str
+) -> Tuple[str, bool]:
+    """Take a reference on the blob for a streamed temp file and place it.
+
+    The caller's transaction holds the blob row lock until commit, so a
+    concurrent release of the same blob cannot unlink the file under us.
+    Also returns whether the blob row is new; if the caller rolls back,
+    the file of a new blob has no row left and should be discarded.
+    """
+    target = blob_path(sha256)
+
+    try:
+        await lock_blob(session, sha256)
+        result = await session.execute(
+            insert(MediaBlob)
+            .values(sha256=sha256, path=str(target), size=size, refcount=1)
+            .on_conflict_do_update(
+                index_elements=[MediaBlob.sha256],
+                set_={"refcount": MediaBlob.refcount + 1},
+            )
+            .returning(literal_column("xmax = 0").label("created"))
+        )
+        created = result.scalar()
+
+        if created or not await aiofiles.os.path.exists(target):
+            await aiofiles.os.makedirs(target.parent, exist_ok=True)
+            await aiofiles.os.replace(temp_path, target)
+    finally:
+        await discard(temp_path)
+
+    return str(target), created
+
+
+async def lock_blob(session: AsyncSession, sha256: str) -> None:
+    """Serialize placing and removing the file of one blob until commit."""
+    await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(sha256))))
+
+
+async def release_blob(
+    session: AsyncSession, sha256: Optional[str], path: str
+) -> Optional[str]:
+    """Drop a reference and return the blob path if it was the last one.
+
+    The file is left in place; pass the path to discard_blob once the
+    caller's transaction has committed.
+    """
+    if sha256 is None:
+        return None
+
+    result = await session.execute(
+        update(MediaBlob)
+        .where(MediaBlob.sha256 == sha256, MediaBlob.path == path)
+        .values(refcount=MediaBlob.refcount - 1)
+        .returning(MediaBlob.refcount, MediaBlob.path)
+    )
+    row = result.one_or_none()
+
+    if row is None or row.refcount > 0:
+        return None
+
+    await session.execute(delete(MediaBlob).where(MediaBlob.sha256 == sha256))
+    return row.path
+
+
+async def discard_blob(session: AsyncSession, sha256: str, path: str) -> None:
+    """Remove a released blob and its variants unless it was taken again."""
+    await lock_blob(session, sha256)
+    result = await session.execute(
+        select(MediaBlob.sha256).where(MediaBlob.sha256 == sha256)
+    )
+
+    if result.scalar() is None:
+        await discard(Path(path))
+        for name in IMAGE_VARIANTS:
+            await discard(variant_path(path, name))
+
+    await session.commit()
+
+
+async def discard(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def file_too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File is too large. Maximum size is {max_size // (1024 * 1024)} MB",
+    )
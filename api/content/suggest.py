@@ -0,0 +1,108 @@
+import heapq
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import async_session
+from .models import Content, ContentCategory
+
+Entry = Tuple[str, int, str]
+
+
+class PrefixIndex:
+    """Sorted (casefolded filename, id, filename) lists per category.
+
+    Lookups bisect to the first key >= prefix and walk forward while the
+    prefix still matches, so they cost O(log n + limit).
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[ContentCategory, List[Entry]] = defaultdict(list)
+        self.loaded_at: Optional[float] = None
+        self.refreshing = False
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split()).casefold()
+
+    async def load(self, session: AsyncSession) -> None:
+        result = await session.execute(
+            select(Content.category, Content.id, Content.filename).where(
+                Content.is_archived.is_(False)
+            )
+        )
+        entries = defaultdict(list)
+        for category, content_id, filename in result:
+            entries[category].append((self.normalize(filename), content_id, filename))
+        for category_entries in entries.values():
+            category_entries.sort()
+
+        self._entries = entries
+        self.loaded_at = time.monotonic()
+
+    def is_stale(self, max_age: float) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > max_age
+
+    def add(self, category: ContentCategory, content_id: int, filename: str) -> None:
+        insort(
+            self._entries[category], (self.normalize(filename), content_id, filename)
+        )
+
+    def remove(self, category: ContentCategory, content_id: int, filename: str) -> None:
+        entries = self._entries.get(category, [])
+        entry = (self.normalize(filename), content_id, filename)
+        position = bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+
+    def _matches(
+        self, category: ContentCategory, prefix: str
+    ) -> Iterator[Tuple[Entry, ContentCategory]]:
+        entries = self._entries.get(category, [])
+        for position in range(bisect_left(entries, (prefix,)), len(entries)):
+            entry = entries[position]
+            if not entry[0].startswith(prefix):
+                return
+            yield entry, category
+
+    def suggest(
+        self, prefix: str, category: Optional[ContentCategory] = None, limit: int = 10
+    ) -> List[dict]:
+        prefix = self.normalize(prefix)
+        categories = [category] if category else list(self._entries)
+        matches = heapq.merge(*(self._matches(c, prefix) for c in categories))
+        return [
+            {"id": content_id, "filename": filename, "category": category.value}
+            for (_, content_id, filename), category in islice(matches, limit)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "age": (
+                round(time.monotonic() - self.loaded_at, 1)
+                if self.loaded_at is not None
+                else None
+            ),
+        }
+
+
+filename_index = PrefixIndex()
+
+
+async def refresh_filename_index() -> None:
+    """Rebuild from the database; picks up writes made by other workers."""
+    if filename_index.refreshing:
+        return
+
+    filename_index.refreshing = True
+    try:
+        async with async_session() as session:
+            await filename_index.load(session)
+    finally:
+        filename_index.refreshing = False
@@ -0,0 +1,162 @@
+"""Plain-text extraction from uploaded documents for full-text search.
+
+Usage: python -m api.content.texts [--force]
+
+txt files are decoded in chunks; docx, xlsx and pptx are zip archives whose
+XML parts are parsed incrementally, so large files are never loaded whole.
+Run as a module to index documents uploaded before search existed.
+"""
+
+import argparse
+import asyncio
+import codecs
+import fnmatch
+import zipfile
+from datetime import datetime
+from typing import Iterator, List
+from xml.etree.ElementTree import ParseError, iterparse
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import config as conf
+from ..database import async_session, engine
+from ..news.models import News  # noqa: F401  (registers the User.news mapper)
+from .models import Content, ContentText
+from .storage import CHUNK_SIZE
+
+# Parts holding visible text, the local name of their text elements and
+# the elements that end a paragraph, shared string or row.
+ARCHIVE_PARTS = {
+    ".docx": (["word/document.xml"], "t", {"p"}),
+    ".xlsx": (
+        ["xl/sharedStrings.xml", "xl/worksheets/sheet*.xml"],
+        "t",
+        {"si", "row"},
+    ),
+    ".pptx": (["ppt/slides/slide*.xml"], "t", {"p"}),
+}
+TEXT_EXTENSIONS = {".txt", *ARCHIVE_PARTS}
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_text_file(path: str) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_archive(path: str, extension: str) -> Iterator[str]:
+    patterns, text_tag, block_tags = ARCHIVE_PARTS[extension]
+
+    with zipfile.ZipFile(path) as archive:
+        names = sorted(
+            name
+            for name in archive.namelist()
+            if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+        )
+        for name in names:
+            with archive.open(name) as part:
+                for _, element in iterparse(part):
+                    tag = local_name(element.tag)
+                    if tag == text_tag and element.text:
+                        yield element.text
+                    elif tag in block_tags:
+                        yield "\n"
+                    element.clear()
+
+
+def extract_text(path: str, extension: str, max_chars: int) -> str:
+    extension = extension.lower()
+    chunks: List[str] = []
+    length = 0
+    parts = (
+        iter_text_file(path) if extension == ".txt" else iter_archive(path, extension)
+    )
+
+    for chunk in parts:
+        chunks.append(chunk[: max_chars - length])
+        length += len(chunks[-1])
+        if length >= max_chars:
+            break
+
+    return "".join(chunks).replace("\x00", "").strip()
+
+
+async def index_content_text(content_id: int) -> None:
+    """Background task run after a document upload has been committed."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(Content.id, Content.path, Content.extension).where(
+                Content.id == content_id
+            )
+        )
+        content = result.one_or_none()
+        if content is None or content.extension.lower() not in TEXT_EXTENSIONS:
+            return
+
+        if await store_text(session, content):
+            await session.commit()
+
+
+async def store_text(session: AsyncSession, content) -> bool:
+    loop = asyncio.get_running_loop()
+    try:
+        body = await loop.run_in_executor(
+            None,
+            extract_text,
+            content.path,
+            content.extension,
+            conf.content_text_max_chars,
+        )
+    except (OSError, zipfile.BadZipFile, ParseError, KeyError) as e:
+        print(f"cannot extract text from {content.path}: {e}")
+        return False
+
+    extracted_at = datetime.now()
+    await session.execute(
+        insert(ContentText)
+        .values(content_id=content.id, body=body, extracted_at=extracted_at)
+        .on_conflict_do_update(
+            index_elements=[ContentText.content_id],
+            set_={"body": body, "extracted_at": extracted_at},
+        )
+    )
+    return True
+
+
+async def backfill(force: bool) -> None:
+    async with async_session() as session:
+        query = select(Content.id, Content.path, Content.extension).where(
+            func.lower(Content.extension).in_(TEXT_EXTENSIONS)
+        )
+        if not force:
+            query = query.where(
+                ~select(ContentText.content_id)
+                .where(ContentText.content_id == Content.id)
+                .exists()
+            )
+        contents = (await session.execute(query)).all()
+
+        done = 0
+        for content in contents:
+            done += await store_text(session, content)
+        await session.commit()
+
+    print(f"{done} of {len(contents)} documents indexed")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--force", action="store_true", help="re-extract documents already indexed"
+    )
+    args = parser.parse_args()
+    asyncio.run(backfill(args.force))
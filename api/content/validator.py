@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import List, Optional
 from fastapi import HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +7,62 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..auth.validator import ValidateError
 from .models import ContentCategory
 
+MB = 1024 * 1024
+
+MAX_FILE_SIZES = {
+    ContentCategory.GALLERY: 10 * MB,
+    ContentCategory.MILITARY_TRAINING_CAMPS: 500 * MB,
+    ContentCategory.EVENTS: 500 * MB,
+    ContentCategory.PATRIOTIC_EDUCATION: 500 * MB,
+    "default": 25 * MB,
+}
+
+
+VALID_EXTENSIONS = {
+    ContentCategory.GALLERY: ["png", "jpg", "jpeg"],
+    ContentCategory.STUDENTS: ["docx", "xlsx"],
+    ContentCategory.MILITARY_TRAINING_CAMPS: ["docx", "pptx", "mp4"],
+    ContentCategory.EVENTS: ["docx", "pptx", "mp4"],
+    ContentCategory.PATRIOTIC_EDUCATION: ["docx", "pptx", "mp4"],
+    ContentCategory.ADDRESS_AND_LINKS: ["docx", "xlsx"],
+    ContentCategory.CONTACTS: ["docx", "xlsx"],
+    "default": ["txt", "docx", "xlsx", "pptx"],
+}
+
+DUPLICATE_FILENAME = "Content with this filename already exists in the selected category. Please choose a different name."
+
+
+def get_max_file_size(category: ContentCategory) -> int:
+    return MAX_FILE_SIZES.get(category, MAX_FILE_SIZES["default"])
+
+
+def check_filename(filename: str) -> None:
+    if not filename or filename == "":
+        raise ValidateError(
+            "Filename cannot be empty", status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if not (4 <= len(filename) <= 50):
+        raise ValidateError(
+            "Filename must be between 4 and 50 characters long",
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if not re.match(r"^[A-Za-z0-9 ]+$", filename):
+        raise ValidateError(
+            "Filename must consist only of English letters, digits, and spaces",
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+
+def check_extension(category: ContentCategory, extension: str) -> None:
+    allowed_extensions = VALID_EXTENSIONS.get(category, VALID_EXTENSIONS["default"])
+
+    if extension not in allowed_extensions:
+        raise ValidateError(
+            f"Invalid file extension for {category.value.replace('_', ' ') if category else 'selected category'}. "
+            f"Valid extensions: {', '.join(allowed_extensions)}",
+            status.HTTP_400_BAD_REQUEST,
+        )
+
 
 class CreateContentValidator:
     def __init__(
@@ -30,20 +86,7 @@ class CreateContentValidator:
             raise HTTPException(status_code=e.status_code, detail=e.detail)
 
     async def validate_filename(self):
-        if not self.filename or self.filename == "":
-            raise ValidateError(
-                "Filename cannot be empty", status.HTTP_422_UNPROCESSABLE_ENTITY
-            )
-        if not (4 <= len(self.filename) <= 50):
-            raise ValidateError(
-                "Filename must be between 4 and 50 characters long",
-                status.HTTP_422_UNPROCESSABLE_ENTITY,
-            )
-        if not re.match(r"^[A-Za-z0-9 ]+$", self.filename):
-            raise ValidateError(
-                "Filename must consist only of English letters, digits, and spaces",
-                status.HTTP_422_UNPROCESSABLE_ENTITY,
-            )
+        check_filename(self.filename)
 
         result = await self.session.execute(
             text(
@@ -53,39 +96,79 @@ class CreateContentValidator:
         )
 
         if result.fetchone():
-            raise ValidateError(
-                "Content with this filename already exists in the selected category. Please choose a different name.",
-                status.HTTP_409_CONFLICT,
-            )
+            raise ValidateError(DUPLICATE_FILENAME, status.HTTP_409_CONFLICT)
 
     async def validate_extension(self):
-        valid_extensions = {
-            ContentCategory.GALLERY: ["png", "jpg", "jpeg"],
-            ContentCategory.STUDENTS: ["docx", "xlsx"],
-            ContentCategory.MILITARY_TRAINING_CAMPS: ["docx", "pptx", "mp4"],
-            ContentCategory.EVENTS: ["docx", "pptx", "mp4"],
-            ContentCategory.PATRIOTIC_EDUCATION: ["docx", "pptx", "mp4"],
-            ContentCategory.ADDRESS_AND_LINKS: ["docx", "xlsx"],
-            ContentCategory.CONTACTS: ["docx", "xlsx"],
-            "default": ["txt", "docx", "xlsx", "pptx"],
-        }
-
-        allowed_extensions = valid_extensions.get(
-            self.category, valid_extensions["default"]
-        )
-
-        if self.extension not in allowed_extensions:
-            raise ValidateError(
-                f"Invalid file extension for {self.category.value.replace('_', ' ') if self.category else 'selected category'}. "
-                f"Valid extensions: {', '.join(allowed_extensions)}",
-                status.HTTP_400_BAD_REQUEST,
-            )
+        check_extension(self.category, self.extension)
 
     async def validate_category(self):
         if self.category not in ContentCategory:
             raise ValidateError("Invalid category", status.HTTP_400_BAD_REQUEST)
 
 
+class CreateContentBatchValidator:
+    """Validates a batch of uploads as a set; failures are kept per file."""
+
+    def __init__(
+        self,
+        filenames: List[str],
+        extensions: List[str],
+        category: ContentCategory,
+        session: AsyncSession,
+    ) -> None:
+        self.filenames = filenames
+        self.extensions = extensions
+        self.category = category
+        self.session = session
+
+    async def validate(self) -> List[Optional[ValidateError]]:
+        if self.category not in ContentCategory:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category"
+            )
+
+        errors: List[Optional[ValidateError]] = []
+        seen = set()
+        for filename, extension in zip(self.filenames, self.extensions):
+            try:
+                check_filename(filename)
+                check_extension(self.category, extension)
+                if filename in seen:
+                    raise ValidateError(
+                        "Filename is repeated in this upload", status.HTTP_409_CONFLICT
+                    )
+                seen.add(filename)
+            except ValidateError as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+
+        await self.validate_unique(errors)
+        return errors
+
+    async def validate_unique(self, errors: List[Optional[ValidateError]]) -> None:
+        candidates = [
+            filename for filename, error in zip(self.filenames, errors) if error is None
+        ]
+        if not candidates:
+            return
+
+        result = await self.session.execute(
+            text(
+                "SELECT filename FROM contents "
+                "WHERE category = :category AND filename = ANY(:filenames)"
+            ),
+            {"category": self.category.name, "filenames": candidates},
+        )
+        taken = set(result.scalars())
+
+        for index, filename in enumerate(self.filenames):
+            if errors[index] is None and filename in taken:
+                errors[index] = ValidateError(
+                    DUPLICATE_FILENAME, status.HTTP_409_CONFLICT
+                )
+
+
 class UpdateContentValidator:
     def __init__(
         self,
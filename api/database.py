@@ -1,10 +1,76 @@
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Optional
+
+import jwt
+from fastapi import Request
+from sqlalchemy.exc import TimeoutError
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from config import config as conf
+from .cache import TTLCache
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait_time = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+def create_engine(database_url: str) -> AsyncEngine:
+    return create_async_engine(
+        database_url,
+        echo=conf.db_echo,
+        poolclass=MeteredPool,
+        pool_size=conf.db_pool_size,
+        max_overflow=conf.db_max_overflow,
+        pool_timeout=conf.db_pool_timeout,
+        pool_recycle=conf.db_pool_recycle,
+        pool_pre_ping=conf.db_pool_pre_ping,
+        connect_args={"statement_cache_size": conf.db_statement_cache_size},
+    )
+
 
-engine = create_async_engine(conf.database_url, echo=True)
+def pool_metrics(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_time_total": round(pool.wait_time_total, 6),
+        "wait_time_avg": (
+            round(pool.wait_time_total / pool.checkouts, 6) if pool.checkouts else 0
+        ),
+        "wait_time_max": round(pool.wait_time_max, 6),
+    }
+
+
+engine = create_engine(conf.database_url)
 
 async_session = async_sessionmaker(
     bind=engine,
@@ -13,10 +79,56 @@ async_session = async_sessionmaker(
 )
 
 
+replica_engine = (
+    create_engine(conf.replica_database_url) if conf.replica_database_url else engine
+)
+
+async_read_session = async_sessionmaker(
+    bind=replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+primary_pins = TTLCache(10000, conf.read_your_writes_seconds)
+
+
+def bearer_identity(request: Request) -> Optional[int]:
+    """User id from a valid bearer token, without touching the database.
+
+    Reads are pinned per user rather than per client address: the frontend
+    and any reverse proxy send everyone's requests from the same host.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+
+    try:
+        return jwt.decode(token, conf.secret_key, algorithms=["HS256"])["identity"]
+    except (jwt.InvalidTokenError, KeyError):
+        return None
+
+
+def pin_reads_to_primary(user_id: int) -> None:
+    if replica_engine is engine:
+        return
+
+    primary_pins.set(user_id, True)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
 
 
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    pinned = replica_engine is not engine and bool(
+        primary_pins.get(bearer_identity(request))
+    )
+    session_factory = async_session if pinned else async_read_session
+
+    async with session_factory() as session:
+        yield session
+
+
 class Base(DeclarativeBase):
     pass
@@ -0,0 +1,123 @@
+"""Print PostgreSQL plans for the queries behind the API routes.
+
+Usage: python -m api.explain [--analyze]
+
+Every router query is run once inside a transaction that is rolled back,
+the SQL it emits is captured and then explained with the same parameters.
+"""
+
+import argparse
+import asyncio
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import engine
+from .auth import queries as auth_qr
+from .content import queries as content_qr
+from .content.models import Content, ContentCategory
+from .content.schemes import ContentSearchFilters, GetContentFilters
+from .news import queries as news_qr
+from .news.models import News
+from .user.models import User
+
+
+async def sample(session: AsyncSession, column, default):
+    result = await session.execute(select(column).limit(1))
+    value = result.scalar()
+    return default if value is None else value
+
+
+async def route_queries(
+    session: AsyncSession,
+) -> List[Tuple[str, Callable[[], Awaitable]]]:
+    news_id = await sample(session, News.id, 1)
+    content_id = await sample(session, Content.id, 1)
+    category = await sample(session, Content.category, ContentCategory.GALLERY)
+    username = await sample(session, User.username, "admin")
+
+    return [
+        ("auth: token lookup", lambda: auth_qr.get_token_with_user(session, "token")),
+        ("GET /news_list", lambda: news_qr.fetch_news_list(session, 0, 10)),
+        ("GET /news_list?skip=100", lambda: news_qr.fetch_news_list(session, 100, 10)),
+        ("GET /news_list?after=", lambda: news_qr.fetch_news_page(session, "", 10)),
+        ("GET /news/{id}", lambda: news_qr.get_news(session, news_id)),
+        (
+            "GET /news/search?q=",
+            lambda: news_qr.search_news(session, "training camp", 0, 10),
+        ),
+        (
+            "GET /contents/?category=",
+            lambda: content_qr.fetch_contents(
+                session, GetContentFilters(category=category), None
+            ),
+        ),
+        (
+            "GET /contents/?archived=true",
+            lambda: content_qr.fetch_contents(
+                session, GetContentFilters(archived=True), None
+            ),
+        ),
+        (
+            "GET /contents/?creator=",
+            lambda: content_qr.fetch_contents(
+                session, GetContentFilters(creator=username), None
+            ),
+        ),
+        ("GET /content/{id}", lambda: content_qr.get_content(session, content_id)),
+        (
+            "GET /content/search?q=",
+            lambda: content_qr.search_contents(
+                session, ContentSearchFilters(q="военные сборы")
+            ),
+        ),
+    ]
+
+
+async def explain(analyze: bool) -> None:
+    explain_prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(bind=connection, expire_on_commit=False)
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            captured.append((statement, parameters))
+
+        for label, run in await route_queries(session):
+            captured.clear()
+            event.listen(engine.sync_engine, "before_cursor_execute", capture)
+            try:
+                await run()
+            except HTTPException as e:
+                print(f"-- {label}: {e.status_code} {e.detail}")
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+            for statement, parameters in list(captured):
+                result = await connection.exec_driver_sql(
+                    explain_prefix + statement, parameters
+                )
+                print(f"=== {label}")
+                print(statement)
+                print(f"-- parameters: {parameters}")
+                for (line,) in result:
+                    print(line)
+                print()
+
+        await session.close()
+        await transaction.rollback()
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--analyze", action="store_true", help="run EXPLAIN (ANALYZE, BUFFERS)"
+    )
+    args = parser.parse_args()
+    asyncio.run(explain(args.analyze))
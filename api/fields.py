@@ -0,0 +1,37 @@
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+
+    return requested or None
+
+
+def load_fields(
+    columns: Dict[str, list], fields: Optional[List[str]], *required
+) -> list:
+    if fields is None:
+        return []
+
+    projected = list(required)
+    for field in fields:
+        projected.extend(columns[field])
+
+    return [load_only(*projected)]
+
+
+def wants(fields: Optional[List[str]], field: str) -> bool:
+    return fields is None or field in fields
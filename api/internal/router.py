@@ -0,0 +1,41 @@
+from fastapi import Depends, APIRouter
+
+from ..database import engine, replica_engine, pool_metrics
+from ..auth.cache import token_cache
+from ..response_cache import response_cache
+from ..content.suggest import filename_index
+from ..auth.middleware import get_current_user
+from ..user.middleware import role_checker
+from ..user.models import User, Role
+
+
+router = APIRouter(prefix="/internal")
+
+
+@router.get("/token_cache", response_model=dict)
+async def get_token_cache_stats(current_user: User = Depends(get_current_user)):
+    await role_checker(current_user, [Role.ADMIN], "only admin can view metrics")
+    return token_cache.stats()
+
+
+@router.get("/db_pool", response_model=dict)
+async def get_db_pool_stats(current_user: User = Depends(get_current_user)):
+    await role_checker(current_user, [Role.ADMIN], "only admin can view metrics")
+    return {
+        "primary": pool_metrics(engine),
+        "replica": (
+            pool_metrics(replica_engine) if replica_engine is not engine else None
+        ),
+    }
+
+
+@router.get("/response_cache", response_model=dict)
+async def get_response_cache_stats(current_user: User = Depends(get_current_user)):
+    await role_checker(current_user, [Role.ADMIN], "only admin can view metrics")
+    return response_cache.stats()
+
+
+@router.get("/suggest_index", response_model=dict)
+async def get_suggest_index_stats(current_user: User = Depends(get_current_user)):
+    await role_checker(current_user, [Role.ADMIN], "only admin can view metrics")
+    return filename_index.stats()
@@ -1,11 +1,15 @@
 import os
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from config import config as conf
 from .auth.router import router as authRouter
 from .content.router import router as contentRouter
+from .media.router import router as mediaRouter
 from .news.router import router as newsRouter
+from .internal.router import router as internalRouter
+from .user.hashing import shutdown_executor
+from .content.images import shutdown_executor as shutdown_image_executor
+from .content.suggest import refresh_filename_index
 
 app = FastAPI(
     title="Polina's Military Registration",
@@ -16,8 +20,20 @@ app = FastAPI(
 if not os.path.exists(conf.media_root):
     os.makedirs(conf.media_root)
     print(f"Папка {conf.media_root} успешно создана.")
-app.mount("/media", StaticFiles(directory=conf.media_root), name="media")
 
 app.include_router(authRouter, tags=["Auth"])
 app.include_router(contentRouter, tags=["Content"])
+app.include_router(mediaRouter, tags=["Media"])
 app.include_router(newsRouter, tags=["News"])
+app.include_router(internalRouter, tags=["Internal"])
+
+
+@app.on_event("startup")
+async def startup():
+    await refresh_filename_index()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    shutdown_executor()
+    shutdown_image_executor()
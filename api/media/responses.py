@@ -0,0 +1,75 @@
+import os
+from typing import Optional
+
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+PATHSEND = "http.response.pathsend"
+ZEROCOPYSEND = "http.response.zerocopysend"
+
+
+class MediaResponse(FileResponse):
+    """FileResponse that hands the file to the server when it can.
+
+    Servers advertising the ASGI ``pathsend`` or ``zerocopysend``
+    extensions get the path or descriptor and send it with sendfile();
+    everything else falls back to Starlette's chunked reads.
+    """
+
+    extensions: dict = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+
+        if PATHSEND in self.extensions:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send({"type": PATHSEND, "path": os.path.abspath(self.path)})
+        elif ZEROCOPYSEND in self.extensions:
+            await self._zerocopy(send, self.status_code, 0)
+        else:
+            await super()._handle_simple(send, send_header_only)
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if send_header_only or ZEROCOPYSEND not in self.extensions:
+            return await super()._handle_single_range(
+                send, start, end, file_size, send_header_only
+            )
+
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await self._zerocopy(send, 206, start, end - start)
+
+    async def _zerocopy(
+        self, send: Send, status: int, offset: int, count: Optional[int] = None
+    ) -> None:
+        with open(self.path, "rb") as file:
+            if count is None:
+                count = os.fstat(file.fileno()).st_size - offset
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": status,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send(
+                {
+                    "type": ZEROCOPYSEND,
+                    "file": file.fileno(),
+                    "offset": offset,
+                    "count": count,
+                }
+            )
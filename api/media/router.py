@@ -0,0 +1,141 @@
+import mimetypes
+import stat
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+
+import aiofiles.os
+from fastapi import Depends, APIRouter, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import config as conf
+from ..conditional import etag_matches, not_modified_response
+from ..database import get_read_session
+from ..content.queries import get_content
+from ..content.storage import variant_path
+from .responses import MediaResponse
+
+router = APIRouter(prefix="/media")
+
+MEDIA_FIELDS = ["filename", "extension", "path", "url"]
+VARIANT_FIELDS = ["filename", "path", "variants"]
+
+IMMUTABLE_CACHE_CONTROL = f"public, max-age={conf.media_cache_max_age}, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+def media_relative_path(path: Path) -> Path:
+    try:
+        return path.resolve().relative_to(Path(conf.media_root).resolve())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+async def media_response(
+    request: Request, path: Path, headers: dict, filename: Optional[str] = None
+) -> Response:
+    relative_path = media_relative_path(path)
+
+    try:
+        stat_result = await aiofiles.os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    media_type = (
+        mimetypes.guess_type(filename or path.name)[0] or "application/octet-stream"
+    )
+
+    if conf.media_delivery == "x-accel-redirect":
+        headers["X-Accel-Redirect"] = (
+            f"{conf.media_accel_prefix.rstrip('/')}/{quote(relative_path.as_posix())}"
+        )
+        return Response(media_type=media_type, headers=headers)
+    if conf.media_delivery == "x-sendfile":
+        headers["X-Sendfile"] = str(path.resolve())
+        return Response(media_type=media_type, headers=headers)
+
+    response = MediaResponse(
+        path,
+        headers=headers,
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
+    if etag_matches(request, response.headers["etag"]):
+        return not_modified_response(
+            {
+                "ETag": response.headers["etag"],
+                "Cache-Control": headers["Cache-Control"],
+            }
+        )
+
+    return response
+
+
+@router.api_route("/content/{content_id}", methods=["GET", "HEAD"])
+async def get_content_file(
+    request: Request,
+    content_id: int,
+    v: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    content = await get_content(session, content_id, MEDIA_FIELDS)
+
+    headers = {
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL
+            if v and v == content.sha256
+            else REVALIDATE_CACHE_CONTROL
+        )
+    }
+    if content.sha256:
+        headers["ETag"] = f'"{content.sha256}"'
+        if etag_matches(request, headers["ETag"]):
+            return not_modified_response(headers)
+
+    return await media_response(
+        request, Path(content.path), headers, content.filename + content.extension
+    )
+
+
+@router.api_route("/content/{content_id}/{variant}", methods=["GET", "HEAD"])
+async def get_content_variant(
+    request: Request,
+    content_id: int,
+    variant: str,
+    v: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    content = await get_content(session, content_id, VARIANT_FIELDS)
+    if variant not in (content.variants or {}):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    headers = {
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL
+            if v and v == content.sha256
+            else REVALIDATE_CACHE_CONTROL
+        )
+    }
+    if content.sha256:
+        headers["ETag"] = f'"{content.sha256}-{variant}"'
+        if etag_matches(request, headers["ETag"]):
+            return not_modified_response(headers)
+
+    return await media_response(
+        request,
+        variant_path(content.path, variant),
+        headers,
+        f"{content.filename}.{variant}.webp",
+    )
+
+
+@router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def get_media_file(request: Request, file_path: str):
+    path = Path(conf.media_root) / file_path
+    return await media_response(
+        request, path, {"Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
@@ -8,13 +8,29 @@ from sqlalchemy import (
     DateTime,
     Boolean,
     Enum,
+    Index,
     UniqueConstraint,
+    func,
+    literal_column,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import column_property, relationship
 
 from ..content.models import Base, BaseEnum
 from .schemes import NewsResponse
 
+# News titles and bodies are validated to be English.
+TEXT_SEARCH_CONFIG = "english"
+
+
+def news_document(title, content):
+    # Rendered with literals only, so queries match the expression index
+    # ix_news_search_vector even under a generic prepared-statement plan.
+    config = literal_column(f"'{TEXT_SEARCH_CONFIG}'")
+    return func.setweight(func.to_tsvector(config, title), literal_column("'A'")).op(
+        "||", return_type=TSVECTOR
+    )(func.setweight(func.to_tsvector(config, content), literal_column("'B'")))
+
 
 class News(Base):
     __tablename__ = "news"
@@ -25,10 +41,26 @@ class News(Base):
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.now)
     last_updated_at = Column(DateTime, default=None)
+    sort_at = Column(DateTime, nullable=False, default=datetime.now)
+    search_vector = column_property(news_document(title, content), deferred=True)
 
     creator = relationship("User", back_populates="news")
 
-    __table_args__ = (UniqueConstraint("title", "content", name="_title_content_uc"),)
+    __table_args__ = (
+        UniqueConstraint("title", "content", name="_title_content_uc"),
+        Index("ix_news_sort_at_id", sort_at.desc(), id.desc()),
+        Index(
+            "ix_news_search_vector",
+            news_document(title, content),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_news_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     async def to_pydantic(self) -> NewsResponse:
         date_format = "%H:%M %d.%m.%Y"
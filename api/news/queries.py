@@ -1,16 +1,28 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select, desc
+from sqlalchemy import String, desc, func, literal, or_, select, tuple_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .models import News
+from ..fields import load_fields, wants
+from ..pagination import encode_cursor, decode_cursor
+from ..response_cache import response_cache, cache_key
+from ..search import HEADLINE_OPTIONS, render_headline
+from ..versions.queries import bump_table_version
+from .models import News, TEXT_SEARCH_CONFIG
+from .serializers import NEWS_COLUMNS, serialize_news_list
 from .schemes import NewNews, NewsResponse, NewsUpdateRequest
 
 from .validator import CreateNewsValidator, UpdateNewsValidator
 
+NEWS_LIST_TAG = "news:list"
+
+
+def news_tag(news_id: int) -> str:
+    return f"news:{news_id}"
+
 
 async def create_news(
     session: AsyncSession, new_news_data: NewNews, current_user_id: int
@@ -29,31 +41,180 @@ async def create_news(
     )
 
     session.add(new_news)
+    await bump_table_version(session, "news")
     await session.commit()
-    await session.refresh(new_news)
+    await session.refresh(new_news, ["creator"])
+    await response_cache.invalidate(NEWS_LIST_TAG)
 
     return await new_news.to_pydantic()
 
 
 async def get_news_list(
-    session: AsyncSession, skip: int, limit: int
-) -> List[NewsResponse]:
+    session: AsyncSession,
+    skip: int,
+    limit: int,
+    fields: Optional[List[str]] = None,
+    version: Optional[int] = None,
+) -> List[dict]:
+    return await response_cache.get_or_load(
+        cache_key(
+            "news_list",
+            skip=skip,
+            limit=limit,
+            fields=sorted(fields or []),
+            version=version,
+        ),
+        [NEWS_LIST_TAG],
+        lambda: fetch_news_list(session, skip, limit, fields),
+    )
+
+
+async def fetch_news_list(
+    session: AsyncSession,
+    skip: int,
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> List[dict]:
+    options = load_fields(NEWS_COLUMNS, fields, News.id)
+    if wants(fields, "creator"):
+        options.append(selectinload(News.creator))
+
     result = await session.execute(
         select(News)
-        .options(selectinload(News.creator))
-        .order_by(desc(News.last_updated_at).nullslast(), desc(News.created_at))
+        .options(*options)
+        .order_by(desc(News.sort_at), desc(News.id))
         .offset(skip)
         .limit(limit)
     )
 
     news_list = result.scalars().all()
-    pydantic_news_list = [await news.to_pydantic() for news in news_list]
-    return pydantic_news_list
+    return serialize_news_list(news_list, fields)
+
+
+async def get_news_page(
+    session: AsyncSession,
+    after: Optional[str],
+    limit: int,
+    fields: Optional[List[str]] = None,
+    version: Optional[int] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    return await response_cache.get_or_load(
+        cache_key(
+            "news_page",
+            after=after,
+            limit=limit,
+            fields=sorted(fields or []),
+            version=version,
+        ),
+        [NEWS_LIST_TAG],
+        lambda: fetch_news_page(session, after, limit, fields),
+    )
+
+
+async def fetch_news_page(
+    session: AsyncSession,
+    after: Optional[str],
+    limit: int,
+    fields: Optional[List[str]] = None,
+) -> Tuple[List[dict], Optional[str]]:
+    options = load_fields(NEWS_COLUMNS, fields, News.id, News.sort_at)
+    if wants(fields, "creator"):
+        options.append(selectinload(News.creator))
+
+    query = (
+        select(News)
+        .options(*options)
+        .order_by(desc(News.sort_at), desc(News.id))
+        .limit(limit + 1)
+    )
+
+    if after:
+        sort_at, news_id = decode_cursor(after, 2)
+        try:
+            sort_at, news_id = datetime.fromisoformat(sort_at), int(news_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="invalid cursor",
+            )
+        query = query.where(tuple_(News.sort_at, News.id) < (sort_at, news_id))
+
+    result = await session.execute(query)
+    news_list = result.scalars().all()
+
+    next_cursor = None
+    if len(news_list) > limit:
+        news_list = news_list[:limit]
+        if news_list:
+            next_cursor = encode_cursor(news_list[-1].sort_at, news_list[-1].id)
 
+    return serialize_news_list(news_list, fields), next_cursor
 
-async def get_news(session: AsyncSession, news_id: int) -> News:
+
+async def search_news(
+    session: AsyncSession, q: str, skip: int, limit: int
+) -> Tuple[List[dict], int]:
+    query = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, q)
+    phrase = literal(q, String)
+    # Full-text matches on title and content, plus fuzzy (trigram) matches
+    # on the title; each side is served by its own GIN index.
+    matches = or_(News.search_vector.op("@@")(query), phrase.op("<%")(News.title))
+    score = func.ts_rank_cd(News.search_vector, query) + func.word_similarity(
+        phrase, News.title
+    )
+
+    page = (
+        select(
+            News.id,
+            score.label("rank"),
+            func.count().over().label("total"),
+        )
+        .where(matches)
+        .order_by(desc("rank"), desc(News.id))
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
     result = await session.execute(
-        select(News).options(selectinload(News.creator)).where(News.id == news_id)
+        select(
+            News,
+            page.c.rank,
+            page.c.total,
+            func.ts_headline(
+                TEXT_SEARCH_CONFIG, News.content, query, HEADLINE_OPTIONS
+            ).label("headline"),
+        )
+        .join(page, page.c.id == News.id)
+        .options(selectinload(News.creator))
+        .order_by(desc(page.c.rank), desc(News.id))
+    )
+    rows = result.all()
+
+    if rows:
+        total = rows[0].total
+    elif skip:
+        result = await session.execute(select(func.count()).where(matches))
+        total = result.scalar()
+    else:
+        total = 0
+
+    news_list = serialize_news_list([row.News for row in rows])
+    for news, row in zip(news_list, rows):
+        news["rank"] = round(row.rank, 4)
+        news["highlight"] = render_headline(row.headline)
+
+    return news_list, total
+
+
+async def get_news(
+    session: AsyncSession, news_id: int, fields: Optional[List[str]] = None
+) -> News:
+    options = load_fields(NEWS_COLUMNS, fields, News.id)
+    if wants(fields, "creator"):
+        options.append(selectinload(News.creator))
+
+    result = await session.execute(
+        select(News).options(*options).where(News.id == news_id)
     )
 
     news = result.scalar_one_or_none()
@@ -65,6 +226,23 @@ async def get_news(session: AsyncSession, news_id: int) -> News:
     return news
 
 
+async def get_news_payload(
+    session: AsyncSession,
+    news_id: int,
+    fields: Optional[List[str]] = None,
+    version: Optional[int] = None,
+) -> dict:
+    async def fetch_news_payload() -> dict:
+        news = await get_news(session, news_id, fields)
+        return serialize_news_list([news], fields)[0]
+
+    return await response_cache.get_or_load(
+        cache_key("news", id=news_id, fields=sorted(fields or []), version=version),
+        [news_tag(news_id)],
+        fetch_news_payload,
+    )
+
+
 async def update_news(
     session: AsyncSession, news_id: int, update_data: NewsUpdateRequest
 ) -> NewsResponse:
@@ -78,8 +256,11 @@ async def update_news(
     if update_data.content:
         news.content = update_data.content
     news.last_updated_at = datetime.now()
+    news.sort_at = news.last_updated_at
 
+    await bump_table_version(session, "news")
     await session.commit()
+    await response_cache.invalidate(NEWS_LIST_TAG, news_tag(news_id))
     return await news.to_pydantic()
 
 
@@ -94,4 +275,6 @@ async def delete_news(
             status_code=status.HTTP_404_NOT_FOUND, detail="news not found"
         )
     await session.delete(news)
+    await bump_table_version(session, "news")
     await session.commit()
+    await response_cache.invalidate(NEWS_LIST_TAG, news_tag(news_id))
@@ -1,16 +1,20 @@
 from typing import List, Optional
-from fastapi import Depends, APIRouter, Query
+from fastapi import Depends, APIRouter, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_session
+from ..conditional import is_not_modified, not_modified_response
+from ..fields import parse_fields
+from ..versions.queries import table_validators
+from ..database import get_session, get_read_session
 from ..auth.middleware import get_current_user
 from ..user.middleware import role_checker
 from ..user.models import User, Role
 
-from .schemes import NewNews, NewsResponse, NewsUpdateRequest
+from .schemes import NewNews, NewsResponse, NewsSearchResult, NewsUpdateRequest
+from .serializers import NEWS_FIELDS
 from . import queries as qr
 
-
 router = APIRouter(prefix="/news")
 
 
@@ -27,23 +31,66 @@ async def create_news(
 
 @router.get(path="_list", response_model=List[NewsResponse])
 async def get_news_list(
+    request: Request,
     skip: Optional[int] = Query(0, ge=0, description="Сколько записей пропустить"),
     limit: Optional[int] = Query(
         10, le=100, description="Максимальное количество записей"
     ),
-    session: AsyncSession = Depends(get_session),
+    after: Optional[str] = Query(
+        None,
+        description="Курсор из заголовка X-Next-Cursor; пустое значение — первая страница",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Список возвращаемых полей через запятую"
+    ),
+    session: AsyncSession = Depends(get_read_session),
+):
+    fields = parse_fields(fields, NEWS_FIELDS)
+    version, headers = await table_validators(session, request, "news")
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    if after is None:
+        news_list = await qr.get_news_list(session, skip, limit, fields, version)
+        return JSONResponse(news_list, headers=headers)
+
+    news_list, next_cursor = await qr.get_news_page(
+        session, after, limit, fields, version
+    )
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return JSONResponse(news_list, headers=headers)
+
+
+@router.get(path="/search", response_model=List[NewsSearchResult])
+async def search_news(
+    q: str = Query(..., min_length=2, max_length=200, description="Поисковый запрос"),
+    skip: Optional[int] = Query(0, ge=0, description="Сколько записей пропустить"),
+    limit: Optional[int] = Query(
+        10, le=100, description="Максимальное количество записей"
+    ),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    news_list = await qr.get_news_list(session, skip, limit)
-    return news_list
+    news_list, total = await qr.search_news(session, q, skip, limit)
+    return JSONResponse(news_list, headers={"X-Total-Count": str(total)})
 
 
 @router.get(path="/{news_id}", response_model=NewsResponse)
 async def get_news(
+    request: Request,
     news_id: int,
-    session: AsyncSession = Depends(get_session),
+    fields: Optional[str] = Query(
+        None, description="Список возвращаемых полей через запятую"
+    ),
+    session: AsyncSession = Depends(get_read_session),
 ):
-    news = await qr.get_news(session, news_id)
-    return await news.to_pydantic()
+    fields = parse_fields(fields, NEWS_FIELDS)
+    version, headers = await table_validators(session, request, "news")
+    if is_not_modified(request, headers):
+        return not_modified_response(headers)
+
+    news = await qr.get_news_payload(session, news_id, fields, version)
+    return JSONResponse(news, headers=headers)
 
 
 @router.patch("/{news_id}", response_model=NewsResponse)
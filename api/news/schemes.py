@@ -14,6 +14,11 @@ class NewsResponse(NewNews, ID):
     last_updated: Optional[str]
 
 
+class NewsSearchResult(NewsResponse):
+    rank: float
+    highlight: str
+
+
 class NewsUpdateRequest(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
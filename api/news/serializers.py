@@ -0,0 +1,40 @@
+from typing import Iterable, List, Optional
+
+from ..user.serializers import serialize_creator
+from .models import News
+
+DATE_FORMAT = "%H:%M %d.%m.%Y"
+
+NEWS_FIELDS = {
+    "id": lambda news, creators: news.id,
+    "title": lambda news, creators: news.title,
+    "content": lambda news, creators: news.content,
+    "creator": lambda news, creators: serialize_creator(news.creator, creators),
+    "created_at": lambda news, creators: news.created_at.strftime(DATE_FORMAT),
+    "last_updated": lambda news, creators: (
+        news.last_updated_at.strftime(DATE_FORMAT) if news.last_updated_at else None
+    ),
+}
+
+NEWS_COLUMNS = {
+    "id": [News.id],
+    "title": [News.title],
+    "content": [News.content],
+    "creator": [News.creator_id],
+    "created_at": [News.created_at],
+    "last_updated": [News.last_updated_at],
+}
+
+
+def serialize_news_list(
+    news_list: Iterable[News], fields: Optional[List[str]] = None
+) -> List[dict]:
+    creators = {}
+    getters = [
+        (field, get)
+        for field, get in NEWS_FIELDS.items()
+        if fields is None or field in fields
+    ]
+    return [
+        {field: get(news, creators) for field, get in getters} for news in news_list
+    ]
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import weakref
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Set
+
+from config import config as conf
+from .cache import TTLCache
+
+try:
+    from redis import asyncio as redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+
+def cache_key(name: str, **params: Any) -> str:
+    return f"{name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+
+class MemoryBackend(TTLCache):
+    """In-process LRU of cached payloads, indexed by tag for invalidation."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize, ttl)
+        self._keys_by_tag: Dict[str, Set[Hashable]] = defaultdict(set)
+
+    async def load(self, key: str) -> Any:
+        item = self.get(key)
+        return None if item is None else item[0]
+
+    async def store(self, key: str, value: Any, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        self.set(key, (value, tags))
+        if key in self._data:
+            for tag in tags:
+                self._keys_by_tag[tag].add(key)
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self.pop(key)
+                removed += 1
+        return removed
+
+    def _on_remove(self, key: Hashable, value: Any) -> None:
+        for tag in value[1]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class RedisBackend:
+    """Shared backend: JSON payloads plus one Redis set of keys per tag."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = "response_cache") -> None:
+        if redis is None:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the redis package"
+            )
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._client = redis.from_url(url)
+
+    async def load(self, key: str) -> Any:
+        raw = await self._client.get(f"{self.prefix}:{key}")
+
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(raw)
+
+    async def store(self, key: str, value: Any, tags: Iterable[str]) -> None:
+        ttl = max(int(self.ttl), 1)
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.set(f"{self.prefix}:{key}", json.dumps(value, default=str), ex=ttl)
+            for tag in tags:
+                pipe.sadd(f"{self.prefix}:tag:{tag}", key)
+                pipe.expire(f"{self.prefix}:tag:{tag}", ttl)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            tag_key = f"{self.prefix}:tag:{tag}"
+            keys = await self._client.smembers(tag_key)
+            if keys:
+                removed += await self._client.delete(
+                    *(f"{self.prefix}:{key.decode()}" for key in keys)
+                )
+            await self._client.delete(tag_key)
+        return removed
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else None,
+        }
+
+
+class ResponseCache:
+    """Read-through cache for serialized query results.
+
+    Concurrent misses on the same key are collapsed into a single load.
+    A load that overlaps an invalidation of one of its tags is not stored,
+    and after an invalidation fills for the tag are held off for
+    ``hold_seconds`` so a lagging replica cannot put stale rows back.
+    """
+
+    def __init__(self, backend: Any, hold_seconds: float = 0) -> None:
+        self.backend = backend
+        self.coalesced = 0
+        self.invalidations = 0
+        self.skipped_stores = 0
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._held_tags = TTLCache(10000, hold_seconds)
+        self._generations: Dict[str, int] = defaultdict(int)
+
+    async def get_or_load(
+        self, key: str, tags: Iterable[str], load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if self.backend is None:
+            return await load()
+
+        value = await self.backend.load(key)
+        if value is not None:
+            return value
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+
+        waited = lock.locked()
+        async with lock:
+            if waited:
+                self.coalesced += 1
+                value = await self.backend.load(key)
+                if value is not None:
+                    return value
+
+            tags = tuple(tags)
+            generations = self._snapshot(tags)
+            value = await load()
+
+            if generations != self._snapshot(tags) or any(
+                self._held_tags.get(tag) for tag in tags
+            ):
+                self.skipped_stores += 1
+            else:
+                await self.backend.store(key, value, tags)
+
+        return value
+
+    def _snapshot(self, tags: Iterable[str]) -> list:
+        return [self._generations.get(tag, 0) for tag in tags]
+
+    async def invalidate(self, *tags: str) -> None:
+        if self.backend is None:
+            return
+
+        for tag in tags:
+            self._generations[tag] += 1
+            self._held_tags.set(tag, True)
+        self.invalidations += await self.backend.invalidate(tags)
+
+    def stats(self) -> dict:
+        if self.backend is None:
+            return {"backend": None}
+
+        return {
+            "backend": type(self.backend).__name__,
+            **self.backend.stats(),
+            "coalesced": self.coalesced,
+            "invalidated_keys": self.invalidations,
+            "skipped_stores": self.skipped_stores,
+        }
+
+
+def create_backend() -> Any:
+    if conf.response_cache_backend == "redis":
+        return RedisBackend(conf.redis_url, conf.response_cache_ttl)
+    if conf.response_cache_backend == "memory":
+        return MemoryBackend(conf.response_cache_size, conf.response_cache_ttl)
+    return None
+
+
+response_cache = ResponseCache(
+    create_backend(),
+    hold_seconds=conf.read_your_writes_seconds if conf.replica_host else 0,
+)
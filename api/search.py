@@ -0,0 +1,19 @@
+import html
+
+# Private-use characters mark matches, so the text can be escaped before
+# they are turned into <mark> tags.
+HEADLINE_START, HEADLINE_STOP, HEADLINE_DELIMITER = "\ue000", "\ue001", "\ue002"
+HEADLINE_OPTIONS = (
+    f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, "
+    f"FragmentDelimiter={HEADLINE_DELIMITER}, "
+    "MaxFragments=3, MaxWords=20, MinWords=8"
+)
+
+
+def render_headline(headline: str) -> str:
+    return (
+        html.escape(headline)
+        .replace(HEADLINE_START, "<mark>")
+        .replace(HEADLINE_STOP, "</mark>")
+        .replace(HEADLINE_DELIMITER, " … ")
+    )
@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+import bcrypt
+
+from config import config as conf
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+
+    if _executor is None:
+        if conf.password_hasher_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=conf.password_hasher_workers)
+        else:
+            _executor = ThreadPoolExecutor(
+                max_workers=conf.password_hasher_workers,
+                thread_name_prefix="password-hasher",
+            )
+
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+
+def _check_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), _hash_password, password)
+
+
+async def check_password(password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), _check_password, password, hashed_password
+    )
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    return await asyncio.gather(
+        *(loop.run_in_executor(executor, _hash_password, p) for p in passwords)
+    )
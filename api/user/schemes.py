@@ -1,5 +1,8 @@
+from typing import Optional, List
 from pydantic import BaseModel
 
+from .models import Role
+
 
 class ID(BaseModel):
     id: int
@@ -12,6 +15,14 @@ class UserCreate(BaseModel):
     full_name: str
 
 
+class UserImportRow(BaseModel):
+    username: str
+    password: str
+    confirm_password: Optional[str] = None
+    full_name: str
+    role: Role = Role.USER
+
+
 class BaseUser(ID):
     username: str
     role: str
@@ -21,3 +32,18 @@ class BaseUser(ID):
 class UserResponse(BaseModel):
     message: str
     user: BaseUser
+
+
+class UserImportResult(BaseModel):
+    row: int
+    username: Optional[str]
+    status_code: int
+    detail: str
+    user: Optional[BaseUser] = None
+
+
+class UserImportResponse(BaseModel):
+    message: str
+    created: int
+    failed: int
+    results: List[UserImportResult]
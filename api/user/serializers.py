@@ -0,0 +1,17 @@
+from typing import Dict
+
+from .models import User, ROLE_NAMES, full_name_to_initials
+
+
+def serialize_creator(user: User, creators: Dict[int, dict]) -> dict:
+    creator = creators.get(user.id)
+
+    if creator is None:
+        creator = creators[user.id] = {
+            "id": user.id,
+            "username": user.username,
+            "full_name": full_name_to_initials(user.full_name),
+            "role": ROLE_NAMES[user.role],
+        }
+
+    return creator
@@ -0,0 +1,13 @@
+from sqlalchemy import BigInteger, Column, DateTime, String, func
+
+from ..database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(String(32), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
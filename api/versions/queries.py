@@ -0,0 +1,45 @@
+from typing import Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import select, update, func, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..conditional import validator_headers
+from .models import TableVersion
+
+
+async def get_table_version(session: AsyncSession, name: str) -> Optional[Row]:
+    result = await session.execute(
+        select(TableVersion.version, TableVersion.updated_at).where(
+            TableVersion.name == name
+        )
+    )
+
+    return result.one_or_none()
+
+
+async def bump_table_version(session: AsyncSession, name: str) -> None:
+    await session.execute(
+        update(TableVersion)
+        .where(TableVersion.name == name)
+        .values(version=TableVersion.version + 1, updated_at=func.now())
+    )
+
+
+async def table_validators(
+    session: AsyncSession, request: Request, name: str
+) -> Tuple[Optional[int], dict]:
+    """Current version of ``name`` and the validator headers derived from it.
+
+    The version also belongs in response cache keys, so a write from any
+    worker or CLI makes cached bodies unreachable together with the ETag.
+    """
+    table_version = await get_table_version(session, name)
+
+    if table_version is None:
+        return None, {}
+
+    return table_version.version, validator_headers(
+        f"{name}:{table_version.version}:{request.url.path}?{request.url.query}",
+        table_version.updated_at,
+    )
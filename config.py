@@ -10,10 +10,44 @@ os.environ.pop("DBNAME", None)
 os.environ.pop("USER", None)
 os.environ.pop("PASSWORD", None)
 
+os.environ.pop("REPLICA_HOST", None)
+os.environ.pop("REPLICA_PORT", None)
+os.environ.pop("READ_YOUR_WRITES_SECONDS", None)
+
+os.environ.pop("DB_ECHO", None)
+os.environ.pop("DB_POOL_SIZE", None)
+os.environ.pop("DB_MAX_OVERFLOW", None)
+os.environ.pop("DB_POOL_TIMEOUT", None)
+os.environ.pop("DB_POOL_RECYCLE", None)
+os.environ.pop("DB_POOL_PRE_PING", None)
+os.environ.pop("DB_STATEMENT_CACHE_SIZE", None)
+
 os.environ.pop("SECRET_KEY", None)
 os.environ.pop("TOKEN_LIFETIME", None)
+os.environ.pop("TOKEN_CACHE_SIZE", None)
+os.environ.pop("TOKEN_CACHE_TTL", None)
+os.environ.pop("AUTH_STATELESS", None)
+os.environ.pop("TOKEN_EPOCH_CACHE_TTL", None)
+os.environ.pop("PASSWORD_HASHER_EXECUTOR", None)
+os.environ.pop("PASSWORD_HASHER_WORKERS", None)
 
 os.environ.pop("MEDIA_ROOT", None)
+os.environ.pop("MEDIA_STORAGE", None)
+os.environ.pop("MEDIA_DELIVERY", None)
+os.environ.pop("MEDIA_ACCEL_PREFIX", None)
+os.environ.pop("MEDIA_CACHE_MAX_AGE", None)
+os.environ.pop("IMAGE_WORKERS", None)
+os.environ.pop("CONTENT_TEXT_MAX_CHARS", None)
+os.environ.pop("SUGGEST_INDEX_TTL", None)
+os.environ.pop("BATCH_UPLOAD_MAX_FILES", None)
+os.environ.pop("BATCH_UPLOAD_MAX_SIZE", None)
+os.environ.pop("BATCH_UPLOAD_CONCURRENCY", None)
+os.environ.pop("CONTENT_COUNT_CACHE_TTL", None)
+os.environ.pop("CATALOG_CACHE_MAX_AGE", None)
+os.environ.pop("RESPONSE_CACHE_BACKEND", None)
+os.environ.pop("RESPONSE_CACHE_SIZE", None)
+os.environ.pop("RESPONSE_CACHE_TTL", None)
+os.environ.pop("REDIS_URL", None)
 
 
 class Config:
@@ -28,12 +62,55 @@ class Config:
         self.password = os.getenv("PASSWORD")
         self.db_name = os.getenv("DBNAME")
 
+        self.replica_host = os.getenv("REPLICA_HOST")
+        self.replica_port = os.getenv("REPLICA_PORT", self.port)
+        self.read_your_writes_seconds = int(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+
+        self.db_echo = os.getenv("DB_ECHO", "false").lower() == "true"
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 10))
+        self.db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", 30))
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", 1800))
+        self.db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+        self.db_statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+
         self.secret_key = os.getenv("SECRET_KEY")
         self.token_lifetime = int(os.getenv("TOKEN_LIFETIME"))
+        self.token_cache_size = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
+        self.token_cache_ttl = int(os.getenv("TOKEN_CACHE_TTL", 60))
+        self.auth_stateless = os.getenv("AUTH_STATELESS", "false").lower() == "true"
+        self.token_epoch_cache_ttl = int(os.getenv("TOKEN_EPOCH_CACHE_TTL", 30))
+        self.password_hasher_executor = os.getenv("PASSWORD_HASHER_EXECUTOR", "thread")
+        self.password_hasher_workers = int(
+            os.getenv("PASSWORD_HASHER_WORKERS", os.cpu_count() or 1)
+        )
 
         self.media_root = os.getenv("MEDIA_ROOT")
+        self.media_storage = os.getenv("MEDIA_STORAGE", "path")
+        self.media_delivery = os.getenv("MEDIA_DELIVERY", "direct")
+        self.media_accel_prefix = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media")
+        self.media_cache_max_age = int(os.getenv("MEDIA_CACHE_MAX_AGE", 31536000))
+        self.image_workers = int(os.getenv("IMAGE_WORKERS", 2))
+        self.content_text_max_chars = int(os.getenv("CONTENT_TEXT_MAX_CHARS", 200000))
+        self.suggest_index_ttl = int(os.getenv("SUGGEST_INDEX_TTL", 300))
+        self.batch_upload_max_files = int(os.getenv("BATCH_UPLOAD_MAX_FILES", 100))
+        self.batch_upload_max_size = int(
+            os.getenv("BATCH_UPLOAD_MAX_SIZE", 1024 * 1024 * 1024)
+        )
+        self.batch_upload_concurrency = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", 4))
+        self.content_count_cache_ttl = int(os.getenv("CONTENT_COUNT_CACHE_TTL", 60))
+        self.catalog_cache_max_age = int(os.getenv("CATALOG_CACHE_MAX_AGE", 86400))
+        self.response_cache_backend = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+        self.response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+        self.response_cache_ttl = int(os.getenv("RESPONSE_CACHE_TTL", 30))
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
         self.database_url = f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.db_name}"
+        self.replica_database_url = (
+            f"postgresql+asyncpg://{self.user}:{self.password}@{self.replica_host}:{self.replica_port}/{self.db_name}"
+            if self.replica_host
+            else None
+        )
 
 
 config = Config()
\ No newline at end of file
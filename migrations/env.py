@@ -7,6 +7,7 @@ from alembic import context
 
 from config import config as conf
 from api.news.models import Base
+from api.versions.models import TableVersion  # noqa: F401
 
 alembic_config = context.config
 section = alembic_config.config_ini_section
@@ -27,6 +28,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -41,7 +43,13 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        # Each revision commits together with its version stamp, so a later
+        # failure cannot leave earlier schema changes applied but unstamped.
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            transaction_per_migration=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,30 @@
+"""user token epoch
+
+Revision ID: 700b49ec8c6f
+Revises: e42ed306f2d3
+Create Date: 2026-10-18 10:10:12.418213
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "700b49ec8c6f"
+down_revision: Union[str, None] = "e42ed306f2d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_epoch", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_epoch")
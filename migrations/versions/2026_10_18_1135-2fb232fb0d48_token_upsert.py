@@ -0,0 +1,35 @@
+"""token upsert
+
+Revision ID: 2fb232fb0d48
+Revises: 700b49ec8c6f
+Create Date: 2026-10-18 11:35:41.072958
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2fb232fb0d48"
+down_revision: Union[str, None] = "700b49ec8c6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM tokens USING tokens AS newer "
+        "WHERE tokens.user_id = newer.user_id AND tokens.id < newer.id"
+    )
+    op.add_column("tokens", sa.Column("expires_at", sa.DateTime(), nullable=True))
+    op.add_column("tokens", sa.Column("epoch", sa.Integer(), nullable=True))
+    op.create_index(op.f("ix_tokens_user_id"), "tokens", ["user_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_tokens_user_id"), table_name="tokens")
+    op.drop_column("tokens", "epoch")
+    op.drop_column("tokens", "expires_at")
@@ -0,0 +1,76 @@
+"""query indexes
+
+Revision ID: 32cfd132e380
+Revises: 2fb232fb0d48
+Create Date: 2026-10-18 12:40:27.551306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "32cfd132e380"
+down_revision: Union[str, None] = "2fb232fb0d48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contents_category_is_archived",
+            "contents",
+            ["category", "is_archived"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contents_active_category_created_at",
+            "contents",
+            ["category", "created_at", "id"],
+            postgresql_where=sa.text("is_archived = false"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contents_creator_id",
+            "contents",
+            ["creator_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_news_last_updated_at_created_at",
+            "news",
+            [
+                sa.text("last_updated_at DESC NULLS LAST"),
+                sa.text("created_at DESC"),
+            ],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_news_last_updated_at_created_at",
+            table_name="news",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contents_creator_id",
+            table_name="contents",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contents_active_category_created_at",
+            table_name="contents",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contents_category_is_archived",
+            table_name="contents",
+            postgresql_concurrently=True,
+        )
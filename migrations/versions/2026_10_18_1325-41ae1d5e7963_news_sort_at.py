@@ -0,0 +1,29 @@
+"""news sort_at
+
+Revision ID: 41ae1d5e7963
+Revises: 32cfd132e380
+Create Date: 2026-10-18 13:25:03.904417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "41ae1d5e7963"
+down_revision: Union[str, None] = "32cfd132e380"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("news", sa.Column("sort_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE news SET sort_at = COALESCE(last_updated_at, created_at)")
+    op.alter_column("news", "sort_at", nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column("news", "sort_at")
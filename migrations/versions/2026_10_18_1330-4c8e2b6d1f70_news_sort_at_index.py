@@ -0,0 +1,42 @@
+"""news sort_at index
+
+Revision ID: 4c8e2b6d1f70
+Revises: 41ae1d5e7963
+Create Date: 2026-10-18 13:30:41.207316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8e2b6d1f70"
+down_revision: Union[str, None] = "41ae1d5e7963"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so it
+    # gets a revision of its own; databases that built it as part of
+    # 41ae1d5e7963 already have it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_sort_at_id",
+            "news",
+            [sa.text("sort_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_news_sort_at_id",
+            table_name="news",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,38 @@
+"""table versions
+
+Revision ID: 5a0c3e7d9b21
+Revises: 4c8e2b6d1f70
+Create Date: 2026-10-18 14:40:12.518306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5a0c3e7d9b21"
+down_revision: Union[str, None] = "4c8e2b6d1f70"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table(
+        "table_versions",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.bulk_insert(table_versions, [{"name": "news"}, {"name": "contents"}])
+
+
+def downgrade() -> None:
+    op.drop_table("table_versions")
@@ -0,0 +1,28 @@
+"""content size and sha256
+
+Revision ID: 6b1d4f8e0c32
+Revises: 5a0c3e7d9b21
+Create Date: 2026-10-18 15:25:41.207735
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6b1d4f8e0c32"
+down_revision: Union[str, None] = "5a0c3e7d9b21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("contents", sa.Column("size", sa.BigInteger(), nullable=True))
+    op.add_column("contents", sa.Column("sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("contents", "sha256")
+    op.drop_column("contents", "size")
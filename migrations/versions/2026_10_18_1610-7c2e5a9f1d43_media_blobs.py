@@ -0,0 +1,36 @@
+"""media blobs
+
+Revision ID: 7c2e5a9f1d43
+Revises: 6b1d4f8e0c32
+Create Date: 2026-10-18 16:10:27.331954
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e5a9f1d43"
+down_revision: Union[str, None] = "6b1d4f8e0c32"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("path", sa.String(length=256), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("refcount", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.drop_constraint("contents_path_key", "contents", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("contents_path_key", "contents", ["path"])
+    op.drop_table("media_blobs")
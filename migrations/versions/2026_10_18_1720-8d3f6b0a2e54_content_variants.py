@@ -0,0 +1,30 @@
+"""content variants
+
+Revision ID: 8d3f6b0a2e54
+Revises: 7c2e5a9f1d43
+Create Date: 2026-10-18 17:20:41.508216
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f6b0a2e54"
+down_revision: Union[str, None] = "7c2e5a9f1d43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "contents",
+        sa.Column("variants", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("contents", "variants")
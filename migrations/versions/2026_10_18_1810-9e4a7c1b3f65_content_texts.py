@@ -0,0 +1,52 @@
+"""content texts
+
+Revision ID: 9e4a7c1b3f65
+Revises: 8d3f6b0a2e54
+Create Date: 2026-10-18 18:10:12.774310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a7c1b3f65"
+down_revision: Union[str, None] = "8d3f6b0a2e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "content_texts",
+        sa.Column("content_id", sa.Integer(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column(
+            "document",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('russian', body)", persisted=True),
+            nullable=True,
+        ),
+        sa.Column("extracted_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["content_id"], ["contents.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("content_id"),
+    )
+    op.create_index(
+        "ix_content_texts_document",
+        "content_texts",
+        ["document"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_content_texts_document",
+        table_name="content_texts",
+        postgresql_using="gin",
+    )
+    op.drop_table("content_texts")
@@ -0,0 +1,25 @@
+"""news search
+
+Revision ID: a1f5d8e2c476
+Revises: 9e4a7c1b3f65
+Create Date: 2026-10-18 18:50:03.127845
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1f5d8e2c476"
+down_revision: Union[str, None] = "9e4a7c1b3f65"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,66 @@
+"""news search indexes
+
+Revision ID: b2c6e9f3a587
+Revises: a1f5d8e2c476
+Create Date: 2026-10-18 18:55:27.418096
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c6e9f3a587"
+down_revision: Union[str, None] = "a1f5d8e2c476"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEWS_DOCUMENT = (
+    "(setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', content), 'B'))"
+)
+
+
+def upgrade() -> None:
+    # Both GIN indexes are built CONCURRENTLY so writes to news are not
+    # blocked during the build. The tsvector index is an expression index
+    # rather than a stored generated column, which would rewrite the table.
+    with op.get_context().autocommit_block():
+        # Databases that ran an earlier a1f5d8e2c476 have the stored column;
+        # dropping it also drops the index built on it.
+        op.execute("ALTER TABLE news DROP COLUMN IF EXISTS search_vector")
+        op.create_index(
+            "ix_news_search_vector",
+            "news",
+            [sa.text(NEWS_DOCUMENT)],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_news_title_trgm",
+            "news",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_news_title_trgm",
+            table_name="news",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_news_search_vector",
+            table_name="news",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
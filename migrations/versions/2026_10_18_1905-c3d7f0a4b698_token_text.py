@@ -0,0 +1,40 @@
+"""token text
+
+Revision ID: c3d7f0a4b698
+Revises: b2c6e9f3a587
+Create Date: 2026-10-18 19:05:48.630215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c3d7f0a4b698"
+down_revision: Union[str, None] = "b2c6e9f3a587"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stateless tokens carry username, role and epoch claims and outgrow
+    # varchar(256); varchar -> text is binary coercible, so no rewrite.
+    op.alter_column(
+        "tokens",
+        "token",
+        existing_type=sa.String(length=256),
+        type_=sa.Text(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "tokens",
+        "token",
+        existing_type=sa.Text(),
+        type_=sa.String(length=256),
+        existing_nullable=False,
+    )
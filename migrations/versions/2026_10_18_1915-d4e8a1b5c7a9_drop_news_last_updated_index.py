@@ -0,0 +1,41 @@
+"""drop news last_updated index
+
+Revision ID: d4e8a1b5c7a9
+Revises: c3d7f0a4b698
+Create Date: 2026-10-18 19:15:06.552871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8a1b5c7a9"
+down_revision: Union[str, None] = "c3d7f0a4b698"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Offset pages are ordered by (sort_at, id) like cursor pages now, which
+    # ix_news_sort_at_id serves.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_news_last_updated_at_created_at",
+            table_name="news",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_news_last_updated_at_created_at",
+            "news",
+            [sa.text("last_updated_at DESC NULLS LAST"), sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
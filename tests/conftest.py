@@ -0,0 +1,49 @@
+"""Fixtures for tests that run against the database from config.py.
+
+The schema must be migrated (``alembic upgrade head``). Every test gets a
+user of its own, removed afterwards together with its tokens, content and
+news.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy import delete
+
+from api.database import async_session, engine
+from api.content.models import Content
+from api.news.models import News
+from api.user.models import Token, User
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def user(anyio_backend):
+    user = User(
+        username=f"test_{uuid.uuid4().hex[:12]}",
+        full_name="Тестов Тест Тестович",
+        hashed_password="-",
+    )
+
+    try:
+        async with async_session() as session:
+            session.add(user)
+            await session.commit()
+    except OSError as e:
+        pytest.skip(f"database is not reachable: {e}")
+
+    yield user
+
+    async with async_session() as session:
+        await session.execute(delete(Content).where(Content.creator_id == user.id))
+        await session.execute(delete(News).where(News.creator_id == user.id))
+        await session.execute(delete(Token).where(Token.user_id == user.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+    # Pooled connections belong to this test's event loop.
+    await engine.dispose()
@@ -0,0 +1,55 @@
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
+
+from config import config as conf
+from api.database import async_session
+from api.main import app
+from api.user.hashing import hash_password
+from api.user.models import Role, User
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "Passw0rd!"
+
+
+@pytest.fixture
+async def admin(user):
+    async with async_session() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(role=Role.ADMIN, hashed_password=await hash_password(PASSWORD))
+        )
+        await session.commit()
+
+    return user
+
+
+@pytest.fixture
+def stateless(monkeypatch):
+    monkeypatch.setattr(conf, "auth_stateless", True)
+
+
+async def test_stateless_login_and_admin_write(admin, stateless):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            "/auth/login", data={"username": admin.username, "password": PASSWORD}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        token = response.json()["access_token"]
+        assert len(token) > 256
+
+        response = await client.post(
+            "/news",
+            json={
+                "title": admin.username.replace("_", " "),
+                "content": "Stateless tokens are accepted.",
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["creator"]["username"] == admin.username
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, update
+
+from config import config as conf
+from api.auth.queries import issue_token
+from api.database import async_session
+from api.user.models import Token, User
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENT_LOGINS = 20
+
+
+async def issue_concurrently(user):
+    async def issue():
+        async with async_session() as session:
+            return await issue_token(session, user)
+
+    return await asyncio.gather(*(issue() for _ in range(CONCURRENT_LOGINS)))
+
+
+async def user_tokens(user):
+    async with async_session() as session:
+        result = await session.execute(
+            select(Token.token, func.count().over()).where(Token.user_id == user.id)
+        )
+        return result.all()
+
+
+async def test_concurrent_logins_share_one_token(user):
+    results = await issue_concurrently(user)
+
+    rows = await user_tokens(user)
+    assert len(rows) == 1
+    assert {token for _, _, token in results} == {rows[0].token}
+    assert [code for code, _, _ in results].count(status.HTTP_201_CREATED) == 1
+
+
+async def test_concurrent_logins_replace_an_expired_token_once(user):
+    _, _, expired_token = (await issue_concurrently(user))[0]
+    async with async_session() as session:
+        await session.execute(
+            update(Token)
+            .where(Token.user_id == user.id)
+            .values(expires_at=datetime.now() - timedelta(hours=1))
+        )
+        await session.commit()
+
+    results = await issue_concurrently(user)
+
+    rows = await user_tokens(user)
+    assert len(rows) == 1
+    assert rows[0].token != expired_token
+    assert {token for _, _, token in results} == {rows[0].token}
+    assert [message for _, message, _ in results].count("token updated") == 1
+
+
+async def test_login_reissues_a_token_with_stale_claims(user, monkeypatch):
+    monkeypatch.setattr(conf, "auth_stateless", True)
+    _, _, stale_token = (await issue_concurrently(user))[0]
+    async with async_session() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(token_epoch=User.token_epoch + 1)
+        )
+        await session.commit()
+    user.token_epoch += 1
+
+    results = await issue_concurrently(user)
+
+    rows = await user_tokens(user)
+    assert len(rows) == 1
+    assert rows[0].token != stale_token
+    assert {token for _, _, token in results} == {rows[0].token}
+    assert [message for _, message, _ in results].count("token updated") == 1
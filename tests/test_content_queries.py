@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy import event
+
+from api.content.models import Content, ContentCategory
+from api.content.queries import content_counts, fetch_contents
+from api.content.schemes import GetContentFilters
+from api.database import async_session, engine
+
+pytestmark = pytest.mark.anyio
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+async def contents(user):
+    async with async_session() as session:
+        session.add_all(
+            Content(
+                filename=f"{user.username} {index}",
+                category=ContentCategory.STUDENTS,
+                path=f"/dev/null/{user.username}/{index}.docx",
+                extension=".docx",
+                creator_id=user.id,
+            )
+            for index in range(3)
+        )
+        await session.commit()
+
+
+@pytest.mark.parametrize("warm_count_cache", [False, True])
+async def test_creator_filter_is_one_statement(user, contents, warm_count_cache):
+    filters = GetContentFilters(creator=user.username, limit=2)
+    content_counts.clear()
+
+    async with async_session() as session:
+        if warm_count_cache:
+            await fetch_contents(session, filters, None)
+
+        with count_statements() as statements:
+            payload, next_cursor, total = await fetch_contents(session, filters, None)
+
+    assert len(statements) == 1
+    assert total == 3
+    assert next_cursor is not None
+    assert [content["creator"]["username"] for content in payload] == [
+        user.username
+    ] * 2
+
+
+async def test_unknown_creator_is_one_statement(user):
+    filters = GetContentFilters(creator=f"{user.username}_missing")
+    content_counts.clear()
+
+    async with async_session() as session:
+        with count_statements() as statements:
+            with pytest.raises(HTTPException) as error:
+                await fetch_contents(session, filters, None)
+
+    assert len(statements) == 1
+    assert error.value.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from api.database import async_session
+from api.news.models import News
+from api.news.queries import fetch_news_list, fetch_news_page
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def news(user):
+    # Identical timestamps, so only the tie-breaker decides the order.
+    now = datetime.now()
+    async with async_session() as session:
+        session.add_all(
+            News(
+                title=f"{user.username} {index}",
+                content="Same timestamp.",
+                creator_id=user.id,
+                created_at=now,
+                last_updated_at=now if index % 2 else None,
+                sort_at=now,
+            )
+            for index in range(5)
+        )
+        await session.commit()
+
+
+async def test_offset_and_cursor_pages_agree(user, news):
+    async with async_session() as session:
+        offset_ids, skip = [], 0
+        while page := await fetch_news_list(session, skip, 2, ["id"]):
+            offset_ids.extend(row["id"] for row in page)
+            skip += 2
+
+        page, after = await fetch_news_page(session, None, 2, ["id"])
+        cursor_ids = [row["id"] for row in page]
+        while after:
+            page, after = await fetch_news_page(session, after, 2, ["id"])
+            cursor_ids.extend(row["id"] for row in page)
+
+    assert offset_ids == cursor_ids
+    assert len(set(offset_ids)) == len(offset_ids)